@@ -8,14 +8,32 @@ License: MIT
 
 import streamlit as st
 import requests
-import xml.etree.ElementTree as ET
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None  # type: ignore[assignment]
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree
 from urllib.parse import urlparse
 import pandas as pd
-from typing import List, Dict, Tuple
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+from typing import List, Dict, Tuple, Optional, Iterable
 import re
+import sys
 from bs4 import BeautifulSoup
-import time
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None  # type: ignore[misc,assignment]
+import os
+import io
+import csv
+import tempfile
 import json
+import orjson
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # Page configuration
 st.set_page_config(
@@ -34,9 +52,46 @@ COMMON_WORDS = {
     'the', 'a', 'an', 'and', 'or', 'in', 'on', 'at', 'to', 'for', 'with'
 }
 
+_WORD_RE = re.compile(r'\b\w+\b')
+_TAG_CLASS_RE = re.compile(r'tag|label')
+_LOC_RE = re.compile(r'<loc>(https?://[^<]+)</loc>')
+_SITEMAP_LOC = '{http://www.sitemaps.org/schemas/sitemap/0.9}loc'
+_PLAIN_LOC = '{}loc'
+
 DEFAULT_RELEVANCE_SCORE = 30
 DEFAULT_TIMEOUT = 5
 MAX_TIMEOUT = 15
+FETCH_WORKERS = 16  # Concurrent page fetches
+CACHE_TTL = 3600  # Seconds fetched sitemaps and pages survive across reruns
+SITEMAP_CHUNK_SIZE = 64 * 1024  # Bytes fed to the sitemap parser at a time
+
+HTTP_CACHE_PATH = os.path.join(tempfile.gettempdir(), 'backlink_analyzer_v1_http.sqlite')
+HTTP_CACHE_TTL = 86400  # Seconds before a cached response is revalidated
+
+# Shared keep-alive session: every page of a sitemap usually lives on one host,
+# so pooled connections avoid a TCP/TLS handshake per request. With requests-cache
+# installed, responses persist in SQLite across sessions and stale entries are
+# revalidated with ETag / Last-Modified, so unchanged pages come back as a 304
+if requests_cache is not None:
+    SESSION = requests_cache.CachedSession(
+        HTTP_CACHE_PATH,
+        backend='sqlite',
+        expire_after=HTTP_CACHE_TTL,
+        cache_control=True
+    )
+else:
+    SESSION = requests.Session()
+# Sitemaps bypass the HTTP cache: st.cache_data already holds them for CACHE_TTL,
+# and a day-long HTTP cache underneath would hide newly published posts
+SITEMAP_SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=50, pool_maxsize=50, max_retries=Retry(total=3, backoff_factor=0.3))
+for _session in (SESSION, SITEMAP_SESSION):
+    _session.mount('https://', _adapter)
+    _session.mount('http://', _adapter)
+    _session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (compatible; GhostBacklinkAnalyzer/1.0; +https://github.com/KnovikLLC/ghost-backlink-analyzer-python)',
+        'Accept-Encoding': 'gzip, deflate'
+    })
 
 # ============================================================================
 # STYLING & BRANDING
@@ -68,6 +123,80 @@ st.markdown("**For Ghost CMS** • Discover internal linking opportunities based
 # HELPER FUNCTIONS
 # ============================================================================
 
+def _iter_sitemap_locs(chunks: Iterable[bytes]) -> List[str]:
+    """
+    Extract <loc> values from sitemap XML as its bytes arrive
+    
+    Namespaced <loc> elements win; un-namespaced ones are only used when the
+    sitemap has no namespaced entries at all.
+    
+    Args:
+        chunks: Raw sitemap bytes, e.g. response.iter_content()
+        
+    Returns:
+        List of URLs from the sitemap
+    
+    Raises:
+        etree.XMLSyntaxError: If the XML is malformed
+    """
+    namespaced: List[str] = []
+    plain: List[str] = []
+    parser = etree.XMLPullParser(events=('end',), tag=(_SITEMAP_LOC, _PLAIN_LOC))
+    
+    def drain():
+        for _, elem in parser.read_events():
+            if elem.text:
+                (namespaced if elem.tag == _SITEMAP_LOC else plain).append(elem.text)
+            elem.clear(keep_tail=True)
+            # Drop already-processed <url> entries so memory stays flat
+            entry = elem.getparent()
+            if entry is not None and entry.getparent() is not None:
+                while entry.getprevious() is not None:
+                    del entry.getparent()[0]
+    
+    for chunk in chunks:
+        parser.feed(chunk)
+        drain()
+    parser.close()
+    drain()
+    return namespaced or plain
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _load_sitemap(sitemap_url: str) -> Tuple[List[str], Optional[Tuple[int, int, str]]]:
+    """
+    Fetch and parse a sitemap; cached across Streamlit reruns
+    
+    Request errors propagate so that failed fetches are not cached.
+    
+    Args:
+        sitemap_url: URL to the sitemap.xml file
+        
+    Returns:
+        Tuple of (urls, parse_error). parse_error is (line, column, message)
+        when the XML was malformed and the URLs were recovered by pattern matching
+    """
+    # Feed the body to the parser as it downloads, so neither the full payload
+    # nor the full tree is ever held in memory
+    with SITEMAP_SESSION.get(sitemap_url, timeout=10, stream=True) as response:
+        response.raise_for_status()
+        try:
+            urls = _iter_sitemap_locs(response.iter_content(chunk_size=SITEMAP_CHUNK_SIZE))
+            parse_error = None
+        except etree.XMLSyntaxError as e:
+            parse_error = (e.position[0], e.position[1], e.msg)
+    
+    if parse_error:
+        # If XML parsing fails, fall back to pattern matching on the raw text
+        # (a malformed sitemap is rare enough that fetching it again is fine)
+        response = SITEMAP_SESSION.get(sitemap_url, timeout=10)
+        response.raise_for_status()
+        return _LOC_RE.findall(response.text), parse_error
+    
+    # Filter out None and empty values
+    return [url for url in urls if url], None
+
+
 def fetch_sitemap(sitemap_url: str) -> List[str]:
     """
     Fetch URLs from sitemap.xml with robust error handling for malformed XML
@@ -79,54 +208,7 @@ def fetch_sitemap(sitemap_url: str) -> List[str]:
         List of URLs from the sitemap
     """
     try:
-        response = requests.get(sitemap_url, timeout=10)
-        response.raise_for_status()
-        
-        # Try to parse as XML
-        try:
-            root = ET.fromstring(response.content)
-        except ET.ParseError as e:
-            # If XML parsing fails, try to fix common issues
-            content = response.text
-            
-            # Try to fix common XML issues
-            st.warning(f"⚠️ XML parsing error on line {e.position[0]}: {e.msg}")
-            st.info("Attempting to recover from malformed XML...")
-            
-            # Try removing invalid characters or fixing common issues
-            try:
-                # Try parsing with error recovery
-                from xml.etree.ElementTree import XMLParser
-                parser = XMLParser()
-                parser.entity = {}
-                root = ET.fromstring(content)
-            except:
-                # Last attempt: extract URLs with regex
-                import re
-                urls = re.findall(r'<loc>(https?://[^<]+)</loc>', content)
-                if urls:
-                    st.success(f"✅ Recovered {len(urls)} URLs using pattern matching")
-                    return urls
-                else:
-                    st.error(f"❌ Could not parse sitemap. Error: {e.msg} at line {e.position[0]}, column {e.position[1]}")
-                    return []
-        
-        # Handle namespace
-        namespace = {'ns': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
-        urls = [loc.text for loc in root.findall('.//ns:loc', namespace) if loc.text]
-        
-        # Try without namespace if empty
-        if not urls:
-            urls = [loc.text for loc in root.findall('.//loc') if loc.text]
-        
-        # Filter out None and empty values
-        urls = [url for url in urls if url]
-        
-        if urls:
-            st.success(f"✅ Successfully fetched {len(urls)} URLs from sitemap")
-        
-        return urls
-        
+        urls, parse_error = _load_sitemap(sitemap_url)
     except requests.exceptions.Timeout:
         st.error("❌ Timeout: Sitemap took too long to load (>10 seconds)")
         return []
@@ -139,6 +221,23 @@ def fetch_sitemap(sitemap_url: str) -> List[str]:
     except Exception as e:
         st.error(f"❌ Unexpected error: {str(e)}")
         return []
+    
+    if parse_error:
+        line, column, msg = parse_error
+        st.warning(f"⚠️ XML parsing error on line {line}: {msg}")
+        st.info("Attempting to recover from malformed XML...")
+        
+        # Last attempt: URLs extracted with regex
+        if urls:
+            st.success(f"✅ Recovered {len(urls)} URLs using pattern matching")
+        else:
+            st.error(f"❌ Could not parse sitemap. Error: {msg} at line {line}, column {column}")
+        return urls
+    
+    if urls:
+        st.success(f"✅ Successfully fetched {len(urls)} URLs from sitemap")
+    
+    return urls
 
 
 def extract_path(url: str) -> str:
@@ -147,11 +246,140 @@ def extract_path(url: str) -> str:
     return parsed.path.strip('/')
 
 
-def fetch_page_tags(url: str, timeout: int = DEFAULT_TIMEOUT) -> List[str]:
+def _loads_json(text: str):
+    """Parse JSON with orjson, falling back to json for the non-standard input it rejects (NaN, Infinity)"""
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return json.loads(text)
+
+
+def _jsonld_keywords(script_text: Optional[str]) -> List[str]:
+    """
+    Keywords from one Schema.org JSON-LD block
+    
+    Args:
+        script_text: Contents of the <script type="application/ld+json"> element
+        
+    Returns:
+        List of keywords, empty if the block is invalid or has none
+    """
+    # Only blocks that can carry keywords are worth parsing
+    if not script_text or 'keywords' not in script_text:
+        return []
+    try:
+        data = _loads_json(script_text)
+        if isinstance(data, dict):
+            if 'keywords' in data:
+                keywords = data['keywords']
+                if isinstance(keywords, str):
+                    return [k.strip() for k in keywords.split(',')]
+                elif isinstance(keywords, list):
+                    return keywords
+    except:
+        pass
+    return []
+
+
+def _extract_metadata_selectolax(html: bytes) -> Tuple[List[str], str, str]:
+    """
+    Extract (raw tags, title, description) with selectolax's Lexbor engine
+    
+    Args:
+        html: Raw page bytes
+        
+    Returns:
+        Tuple of (tags, title, description)
+    """
+    tree = LexborHTMLParser(html)
+    
+    tags = []
+    
+    # Method 1: Meta keywords tag
+    meta_keywords = tree.css_first('meta[name="keywords"]')
+    keywords_content = meta_keywords.attributes.get('content') if meta_keywords else None
+    if keywords_content:
+        tags.extend([t.strip() for t in keywords_content.split(',')])
+    
+    # Method 2: Schema.org JSON-LD markup
+    for script in tree.css('script[type="application/ld+json"]'):
+        tags.extend(_jsonld_keywords(script.text()))
+    
+    # Method 3: Ghost tag links (any class containing "tag" or "label")
+    for tag in tree.css('a[class*="tag"], a[class*="label"]'):
+        tag_text = tag.text(strip=True)
+        if tag_text and len(tag_text) < 50:
+            tags.append(tag_text)
+    
+    # Get title from og:title or title tag
+    title_elem = tree.css_first('meta[property="og:title"]') or tree.css_first('title')
+    title_text = ""
+    if title_elem:
+        title_text = title_elem.attributes.get('content') or title_elem.text(strip=True)
+    
+    # Get description from meta tag
+    desc_elem = tree.css_first('meta[name="description"]')
+    desc_text = (desc_elem.attributes.get('content') or "") if desc_elem else ""
+    
+    return tags, title_text, desc_text
+
+
+def _extract_metadata_bs4(html: bytes) -> Tuple[List[str], str, str]:
     """
-    Extract tags from Ghost CMS page
+    Extract (raw tags, title, description) with BeautifulSoup, used when
+    selectolax is not installed or fails on a page
+    
+    Args:
+        html: Raw page bytes
+        
+    Returns:
+        Tuple of (tags, title, description)
+    """
+    soup = BeautifulSoup(html, 'lxml')
+    
+    tags = []
+    
+    # Method 1: Meta keywords tag
+    meta_keywords = soup.find('meta', {'name': 'keywords'})
+    if meta_keywords and meta_keywords.get('content'):
+        tags.extend([t.strip() for t in meta_keywords['content'].split(',')])
+    
+    # Method 2: Schema.org JSON-LD markup
+    script_tags = soup.find_all('script', {'type': 'application/ld+json'})
+    for script in script_tags:
+        tags.extend(_jsonld_keywords(script.string))
+    
+    # Method 3: Ghost tag links
+    tag_links = soup.find_all('a', class_=_TAG_CLASS_RE)
+    for tag in tag_links:
+        tag_text = tag.get_text(strip=True)
+        if tag_text and len(tag_text) < 50:
+            tags.append(tag_text)
     
-    Looks for tags in:
+    # Get title from og:title or title tag
+    title_elem = soup.find('meta', {'property': 'og:title'}) or soup.find('title')
+    title_text = (
+        title_elem.get('content')
+        if title_elem and title_elem.get('content')
+        else (title_elem.get_text(strip=True) if title_elem else "")
+    )
+    
+    # Get description from meta tag
+    desc_elem = soup.find('meta', {'name': 'description'})
+    desc_text = desc_elem.get('content', '') if desc_elem else ""
+    
+    return tags, title_text, desc_text
+
+
+@st.cache_data(ttl=CACHE_TTL, show_spinner=False)
+def _fetch_page_metadata_cached(url: str, timeout: int = DEFAULT_TIMEOUT) -> Tuple[List[str], str, str]:
+    """
+    Extract tags, title and description from Ghost CMS page in one request
+    
+    Cached per (url, timeout) across Streamlit reruns; errors propagate so
+    that failed fetches are not cached.
+    
+    Tags are looked for in:
     1. Meta keywords tag
     2. Schema.org JSON-LD markup
     3. Ghost tag links in HTML
@@ -161,168 +389,261 @@ def fetch_page_tags(url: str, timeout: int = DEFAULT_TIMEOUT) -> List[str]:
         timeout: Request timeout in seconds
         
     Returns:
-        List of tags found on the page
+        Tuple of (tags, title, description)
     """
-    try:
-        response = requests.get(url, timeout=timeout)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        tags = []
-        
-        # Method 1: Meta keywords tag
-        meta_keywords = soup.find('meta', {'name': 'keywords'})
-        if meta_keywords and meta_keywords.get('content'):
-            tags.extend([t.strip() for t in meta_keywords['content'].split(',')])
-        
-        # Method 2: Schema.org JSON-LD markup
-        script_tags = soup.find_all('script', {'type': 'application/ld+json'})
-        for script in script_tags:
-            try:
-                data = json.loads(script.string)
-                if isinstance(data, dict):
-                    if 'keywords' in data:
-                        keywords = data['keywords']
-                        if isinstance(keywords, str):
-                            tags.extend([k.strip() for k in keywords.split(',')])
-                        elif isinstance(keywords, list):
-                            tags.extend(keywords)
-            except:
-                pass
-        
-        # Method 3: Ghost tag links
-        tag_links = soup.find_all('a', {'class': re.compile(r'tag|label')})
-        for tag in tag_links:
-            tag_text = tag.get_text(strip=True)
-            if tag_text and len(tag_text) < 50:
-                tags.append(tag_text)
-        
-        # Clean and deduplicate tags
-        tags = [t.lower().strip() for t in tags if t and len(t.strip()) > 0]
-        tags = list(set(tags))
-        
-        return tags
-    except Exception:
-        return []
+    response = SESSION.get(url, timeout=timeout, stream=False)
+    response.raise_for_status()
+    
+    # Lexbor handles nearly everything; BeautifulSoup is kept for pages it cannot parse
+    fields = None
+    if LexborHTMLParser is not None:
+        try:
+            fields = _extract_metadata_selectolax(response.content)
+        except Exception:
+            fields = None
+    if fields is None:
+        fields = _extract_metadata_bs4(response.content)
+    tags, title_text, desc_text = fields
+    
+    # Clean and deduplicate tags in one pass, keeping first-seen order (stable across runs)
+    seen: Dict[str, None] = {}
+    for t in tags:
+        if not t:
+            continue
+        key = t.lower().strip()
+        if key and key not in seen:
+            seen[key] = None
+    tags = list(seen)
+    
+    return tags, title_text, desc_text
 
 
-def get_page_title_and_description(url: str) -> Tuple[str, str]:
+def fetch_page_metadata(url: str, timeout: int = DEFAULT_TIMEOUT) -> Tuple[List[str], str, str]:
     """
-    Extract title and description from page
+    Extract tags, title and description from Ghost CMS page in one request
     
     Args:
         url: Page URL
+        timeout: Request timeout in seconds
         
     Returns:
-        Tuple of (title, description)
+        Tuple of (tags, title, description); empty values if the page could not be fetched
     """
     try:
-        response = requests.get(url, timeout=DEFAULT_TIMEOUT)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Get title from og:title or title tag
-        title_elem = soup.find('meta', {'property': 'og:title'}) or soup.find('title')
-        title_text = (
-            title_elem.get('content')
-            if title_elem and title_elem.get('content')
-            else (title_elem.get_text(strip=True) if title_elem else "")
-        )
-        
-        # Get description from meta tag
-        desc_elem = soup.find('meta', {'name': 'description'})
-        desc_text = desc_elem.get('content', '') if desc_elem else ""
-        
-        return title_text, desc_text
+        return _fetch_page_metadata_cached(url, timeout)
     except Exception:
-        return "", ""
+        return [], "", ""
+
 
+def extract_path_words(url: str) -> set:
+    """Meaningful lowercase words from the URL path"""
+    return set(_WORD_RE.findall(extract_path(url).lower())) - COMMON_WORDS
 
-def calculate_semantic_relevance(
-    url1: str,
-    url2: str,
+
+def precompute_url_features(
+    urls: List[str],
     tags_dict: Dict[str, List[str]]
+) -> Tuple[Dict[str, frozenset], Dict[str, frozenset]]:
+    """
+    Build per-URL path-word and tag frozensets once, so the opportunity loops
+    only do set arithmetic
+    
+    Args:
+        urls: URLs to prepare
+        tags_dict: Dictionary mapping URLs to their tags
+        
+    Returns:
+        Tuple of (path_words, tag_sets), both keyed by URL
+    """
+    # Interned strings make the repeated tag/word hash lookups compare by identity
+    path_words = {url: frozenset(map(sys.intern, extract_path_words(url))) for url in urls}
+    tag_sets = {url: frozenset(map(sys.intern, tags_dict.get(url, []))) for url in urls}
+    return path_words, tag_sets
+
+
+def _postings(item_sets: List[frozenset]) -> Optional[Tuple[Dict[str, int], np.ndarray, np.ndarray]]:
+    """
+    Build an inverted index (token -> rows containing it) from pre-tokenized sets
+    
+    Args:
+        item_sets: One set of tokens (tags or path words) per row
+        
+    Returns:
+        Tuple of (vocabulary, indptr, rows) in CSC layout, so the rows holding
+        token j are rows[indptr[j]:indptr[j + 1]]; None when no row has any token
+    """
+    if not any(item_sets):
+        return None
+    vectorizer = CountVectorizer(analyzer=list, binary=True, dtype=np.int32)
+    matrix = vectorizer.fit_transform(item_sets).tocsc()
+    return vectorizer.vocabulary_, matrix.indptr, matrix.indices
+
+
+def build_url_index(
+    all_urls: List[str],
+    path_words: Dict[str, frozenset],
+    tag_sets: Dict[str, frozenset]
 ) -> Dict:
     """
-    Calculate semantic relevance between two URLs
+    Index tags and path words of every URL once per analysis
     
-    Uses tag overlap (70% weight) and URL path similarity (30% weight)
+    A query then only visits the URLs that share at least one tag or path
+    word with it, instead of comparing against all of all_urls.
     
     Args:
-        url1: First URL
-        url2: Second URL
-        tags_dict: Dictionary mapping URLs to their tags
+        all_urls: Candidate URLs
+        path_words: Path words keyed by URL
+        tag_sets: Tag sets keyed by URL
         
     Returns:
-        Dictionary with relevance scores
+        Dictionary with the tag and path-word postings and per-URL set sizes
     """
-    path1 = extract_path(url1).lower()
-    path2 = extract_path(url2).lower()
-    
-    # Get tags for both URLs
-    tags1 = set(tags_dict.get(url1, []))
-    tags2 = set(tags_dict.get(url2, []))
-    
-    # Extract meaningful words from paths
-    words1 = set(re.findall(r'\b\w+\b', path1)) - COMMON_WORDS
-    words2 = set(re.findall(r'\b\w+\b', path2)) - COMMON_WORDS
-    
-    # Calculate path similarity score
-    if words1 and words2:
-        intersection = len(words1 & words2)
-        union = len(words1 | words2)
-        path_score = (intersection / union) * 100 if union > 0 else 0
-    else:
-        path_score = 0
+    tags = [tag_sets[url] for url in all_urls]
+    words = [path_words[url] for url in all_urls]
+    return {
+        'size': len(all_urls),
+        'tags': _postings(tags),
+        'words': _postings(words),
+        'tag_sizes': np.fromiter(map(len, tags), dtype=np.int64, count=len(tags)),
+        'word_sizes': np.fromiter(map(len, words), dtype=np.int64, count=len(words)),
+    }
+
+
+def _overlap_counts(postings, query: frozenset, n: int) -> np.ndarray:
+    """Number of tokens each indexed row shares with query"""
+    if postings is None or not query:
+        return np.zeros(n, dtype=np.int64)
+    vocabulary, indptr, rows = postings
+    hits = [rows[indptr[j]:indptr[j + 1]] for j in map(vocabulary.get, query) if j is not None]
+    if not hits:
+        return np.zeros(n, dtype=np.int64)
+    return np.bincount(np.concatenate(hits), minlength=n).astype(np.int64)
+
+
+def score_candidates(
+    new_url: str,
+    all_urls: List[str],
+    path_words: Dict[str, frozenset],
+    tag_sets: Dict[str, frozenset],
+    index: Optional[Dict] = None
+) -> Dict[str, np.ndarray]:
+    """
+    Calculate semantic relevance of every URL to the new article in one vectorized pass
     
-    # Calculate tag-based relevance score
-    tag_intersection = len(tags1 & tags2)
-    if tag_intersection > 0:
-        tag_score = min(100, 30 + (tag_intersection * 25))
-    else:
-        tag_score = 0
+    Uses tag overlap (70% weight) and URL path similarity (30% weight); when
+    neither page has tags, the path similarity alone is the score. Overlap
+    counts come from the inverted index and unions from the set sizes.
+    
+    Args:
+        new_url: The new article URL
+        all_urls: Candidate URLs
+        path_words: Path words keyed by URL
+        tag_sets: Tag sets keyed by URL
+        index: Prebuilt build_url_index over all_urls (built here if omitted)
+        
+    Returns:
+        Dictionary of float64 score arrays (0-100, rounded to 2 decimals) aligned with all_urls
+    """
+    n = len(all_urls)
+    new_words = path_words[new_url]
+    new_tags = tag_sets[new_url]
+    
+    # No tags and no path words: nothing can overlap, so skip the index and the arithmetic
+    if not new_tags and not new_words:
+        return {
+            'semantic_score': np.zeros(n, dtype=np.float64),
+            'tag_score': np.zeros(n, dtype=np.float64),
+            'path_score': np.zeros(n, dtype=np.float64),
+        }
+    
+    if index is None:
+        index = build_url_index(all_urls, path_words, tag_sets)
+    
+    tag_inter = _overlap_counts(index['tags'], new_tags, n)
+    path_inter = _overlap_counts(index['words'], new_words, n)
+    
+    # Path similarity: Jaccard of path words, |A ∪ B| = |A| + |B| - |A ∩ B|
+    has_words = (index['word_sizes'] > 0) & bool(new_words)
+    path_union = index['word_sizes'] + len(new_words) - path_inter
+    path_score = np.zeros(n, dtype=np.float64)
+    np.divide(path_inter, path_union, out=path_score, where=has_words & (path_union > 0))
+    path_score *= 100
+    
+    # Tag score: 30 for the first shared tag, +25 for each further one, capped at 100
+    tag_score = np.where(tag_inter > 0, np.minimum(100.0, 30.0 + tag_inter * 25.0), 0.0)
     
     # Combined score: 70% tags, 30% path similarity
-    combined_semantic = (tag_score * 0.7) + (path_score * 0.3) if (tags1 or tags2) else path_score
+    has_tags = (index['tag_sizes'] > 0) | bool(new_tags)
+    semantic_score = np.where(has_tags, tag_score * 0.7 + path_score * 0.3, path_score)
     
     return {
-        'semantic_score': round(combined_semantic, 2),
-        'tag_score': round(tag_score, 2),
-        'path_score': round(path_score, 2),
-        'common_tags': list(tags1 & tags2),
-        'tags1': list(tags1),
-        'tags2': list(tags2)
+        'semantic_score': np.round(semantic_score, 2),
+        'tag_score': np.round(tag_score, 2),
+        'path_score': np.round(path_score, 2),
     }
 
 
+def build_title_array(all_urls: List[str], content_cache: Dict[str, Tuple[str, str]]) -> np.ndarray:
+    """
+    Page titles as an object array aligned with all_urls
+    
+    Args:
+        all_urls: Candidate URLs
+        content_cache: (title, description) keyed by URL
+        
+    Returns:
+        NumPy object array of titles ("" for pages without content)
+    """
+    return np.array([content_cache.get(url, ("", ""))[0] for url in all_urls], dtype=object)
+
+
+def _candidate_indices(
+    new_url: str,
+    all_urls: List[str],
+    scores: Dict[str, np.ndarray],
+    min_relevance: float
+) -> np.ndarray:
+    """Indices (in all_urls order) whose semantic score passes min_relevance, excluding the new article"""
+    indices = np.flatnonzero(scores['semantic_score'] >= min_relevance)
+    return np.asarray([i for i in indices.tolist() if all_urls[i] != new_url], dtype=np.intp)
+
+
 def find_outbound_opportunities(
     new_url: str,
     all_urls: List[str],
     tags_dict: Dict[str, List[str]],
     content_cache: Dict[str, Tuple[str, str]],
-    min_relevance: float
+    min_relevance: float,
+    path_words: Optional[Dict[str, frozenset]] = None,
+    tag_sets: Optional[Dict[str, frozenset]] = None,
+    titles: Optional[np.ndarray] = None,
+    index: Optional[Dict] = None,
+    scores: Optional[Dict[str, np.ndarray]] = None
 ) -> List[Dict]:
     """Find pages that the new article should link to"""
     opportunities = []
+    if path_words is None or tag_sets is None:
+        path_words, tag_sets = precompute_url_features(all_urls + [new_url], tags_dict)
+    new_tags = tag_sets[new_url]
+    # Relevance is symmetric, so both directions can share one score_candidates result
+    if scores is None:
+        scores = score_candidates(new_url, all_urls, path_words, tag_sets, index)
+    if titles is None:
+        titles = build_title_array(all_urls, content_cache)
     
-    for target_url in all_urls:
-        if target_url == new_url:
-            continue
-        
-        relevance = calculate_semantic_relevance(new_url, target_url, tags_dict)
-        semantic_score = relevance['semantic_score']
-        
-        if semantic_score >= min_relevance:
-            title, _ = content_cache.get(target_url, ("", ""))
-            opportunities.append({
-                'url': target_url,
-                'title': title,
-                'semantic_score': semantic_score,
-                'tag_score': relevance['tag_score'],
-                'path_score': relevance['path_score'],
-                'common_tags': relevance['common_tags'],
-                'target_tags': relevance['tags2']
-            })
+    indices = _candidate_indices(new_url, all_urls, scores, min_relevance)
+    for i, title in zip(indices.tolist(), titles.take(indices).tolist()):
+        target_url = all_urls[i]
+        target_tags = tag_sets[target_url]
+        opportunities.append({
+            'url': target_url,
+            'title': title,
+            'semantic_score': float(scores['semantic_score'][i]),
+            'tag_score': float(scores['tag_score'][i]),
+            'path_score': float(scores['path_score'][i]),
+            'common_tags': list(new_tags & target_tags),
+            'target_tags': list(target_tags)
+        })
     
     return sorted(opportunities, key=lambda x: x['semantic_score'], reverse=True)
 
@@ -332,33 +653,81 @@ def find_inbound_opportunities(
     all_urls: List[str],
     tags_dict: Dict[str, List[str]],
     content_cache: Dict[str, Tuple[str, str]],
-    min_relevance: float
+    min_relevance: float,
+    path_words: Optional[Dict[str, frozenset]] = None,
+    tag_sets: Optional[Dict[str, frozenset]] = None,
+    titles: Optional[np.ndarray] = None,
+    index: Optional[Dict] = None,
+    scores: Optional[Dict[str, np.ndarray]] = None
 ) -> List[Dict]:
     """Find pages that should link to the new article"""
     opportunities = []
+    if path_words is None or tag_sets is None:
+        path_words, tag_sets = precompute_url_features(all_urls + [new_url], tags_dict)
+    new_tags = tag_sets[new_url]
+    # Relevance is symmetric, so both directions can share one score_candidates result
+    if scores is None:
+        scores = score_candidates(new_url, all_urls, path_words, tag_sets, index)
+    if titles is None:
+        titles = build_title_array(all_urls, content_cache)
     
-    for source_url in all_urls:
-        if source_url == new_url:
-            continue
-        
-        relevance = calculate_semantic_relevance(source_url, new_url, tags_dict)
-        semantic_score = relevance['semantic_score']
-        
-        if semantic_score >= min_relevance:
-            title, _ = content_cache.get(source_url, ("", ""))
-            opportunities.append({
-                'url': source_url,
-                'title': title,
-                'semantic_score': semantic_score,
-                'tag_score': relevance['tag_score'],
-                'path_score': relevance['path_score'],
-                'common_tags': relevance['common_tags'],
-                'source_tags': relevance['tags1']
-            })
+    indices = _candidate_indices(new_url, all_urls, scores, min_relevance)
+    for i, title in zip(indices.tolist(), titles.take(indices).tolist()):
+        source_url = all_urls[i]
+        source_tags = tag_sets[source_url]
+        opportunities.append({
+            'url': source_url,
+            'title': title,
+            'semantic_score': float(scores['semantic_score'][i]),
+            'tag_score': float(scores['tag_score'][i]),
+            'path_score': float(scores['path_score'][i]),
+            'common_tags': list(source_tags & new_tags),
+            'source_tags': list(source_tags)
+        })
     
     return sorted(opportunities, key=lambda x: x['semantic_score'], reverse=True)
 
 
+TABLE_COLUMNS = ['Title', 'URL', 'Score', 'Tag Score', 'Common Tags']
+
+
+def opportunity_rows(opportunities: List[Dict]) -> List[Tuple]:
+    """
+    Table rows for the opportunity tables and CSV downloads
+    
+    Args:
+        opportunities: Output of find_outbound_opportunities / find_inbound_opportunities
+        
+    Returns:
+        List of tuples in TABLE_COLUMNS order, scores kept numeric so the table sorts by value
+    """
+    return [(
+        opp['title'][:50] + '...' if len(opp['title']) > 50 else opp['title'],
+        opp['url'],
+        opp['semantic_score'],
+        # Tag scores are whole numbers (30 + 25 per extra shared tag), shown and exported as ints
+        int(opp['tag_score']),
+        ', '.join(opp['common_tags']) if opp['common_tags'] else '-'
+    ) for opp in opportunities]
+
+
+def rows_to_csv(rows: List[Tuple]) -> str:
+    """
+    Serialize table rows to CSV without building a DataFrame
+    
+    Args:
+        rows: Output of opportunity_rows
+        
+    Returns:
+        CSV text with a header row
+    """
+    buf = io.StringIO()
+    writer = csv.writer(buf, lineterminator='\n')
+    writer.writerow(TABLE_COLUMNS)
+    writer.writerows(rows)
+    return buf.getvalue()
+
+
 # ============================================================================
 # SIDEBAR CONFIGURATION
 # ============================================================================
@@ -436,16 +805,21 @@ if st.sidebar.button("🔍 Analyze Internal Linking", type="primary", use_contai
             tags_dict = {}
             content_cache = {}
             
-            for idx, url in enumerate(all_urls):
-                status_text.text(f"Analyzing {idx + 1}/{len(all_urls)}: {url}")
-                progress = (idx + 1) / len(all_urls)
-                progress_bar.progress(progress)
-                
-                tags_dict[url] = fetch_page_tags(url, timeout=fetch_timeout)
-                title, desc = get_page_title_and_description(url)
-                content_cache[url] = (title, desc)
-                
-                time.sleep(0.3)
+            # Page fetches are network-bound, so overlap them on a thread pool;
+            # one request and one parse per page for tags, title and description
+            with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+                futures = {
+                    executor.submit(fetch_page_metadata, url, fetch_timeout): url
+                    for url in all_urls
+                }
+                for idx, future in enumerate(as_completed(futures)):
+                    url = futures[future]
+                    status_text.text(f"Analyzing {idx + 1}/{len(all_urls)}: {url}")
+                    progress = (idx + 1) / len(all_urls)
+                    progress_bar.progress(progress)
+                    
+                    tags_dict[url], title, desc = future.result()
+                    content_cache[url] = (title, desc)
             
             progress_bar.empty()
             status_text.empty()
@@ -454,11 +828,19 @@ if st.sidebar.button("🔍 Analyze Internal Linking", type="primary", use_contai
             
             # Find opportunities
             with st.spinner("🔍 Finding linking opportunities..."):
+                # Path words, tag sets and titles are derived once and shared by both directions
+                path_words, tag_sets = precompute_url_features(all_urls, tags_dict)
+                titles = build_title_array(all_urls, content_cache)
+                # Relevance is symmetric: score once, then assemble each direction's payload.
+                # The URL index is only built when the new article has tags or path words
+                scores = score_candidates(new_article_url, all_urls, path_words, tag_sets)
                 outbound = find_outbound_opportunities(
-                    new_article_url, all_urls, tags_dict, content_cache, min_relevance_score
+                    new_article_url, all_urls, tags_dict, content_cache, min_relevance_score,
+                    path_words, tag_sets, titles, scores=scores
                 )
                 inbound = find_inbound_opportunities(
-                    new_article_url, all_urls, tags_dict, content_cache, min_relevance_score
+                    new_article_url, all_urls, tags_dict, content_cache, min_relevance_score,
+                    path_words, tag_sets, titles, scores=scores
                 )
             
             # Display metrics
@@ -491,13 +873,8 @@ if st.sidebar.button("🔍 Analyze Internal Linking", type="primary", use_contai
             st.markdown("Pages that your new article should link to:")
             
             if outbound:
-                outbound_df = pd.DataFrame([{
-                    'Title': opp['title'][:50] + '...' if len(opp['title']) > 50 else opp['title'],
-                    'URL': opp['url'],
-                    'Score': opp['semantic_score'],
-                    'Tag Score': opp['tag_score'],
-                    'Common Tags': ', '.join(opp['common_tags']) if opp['common_tags'] else '-'
-                } for opp in outbound])
+                outbound_rows = opportunity_rows(outbound)
+                outbound_df = pd.DataFrame(outbound_rows, columns=TABLE_COLUMNS)
                 
                 st.dataframe(outbound_df, use_container_width=True, hide_index=True)
                 
@@ -505,19 +882,19 @@ if st.sidebar.button("🔍 Analyze Internal Linking", type="primary", use_contai
                     for idx, opp in enumerate(outbound, 1):
                         st.markdown(f"### {idx}. {opp['title']}")
                         st.markdown(f"**URL:** `{opp['url']}`")
-                        st.markdown(f"**Score:** {opp['semantic_score']}% | "
-                                  f"**Tag Score:** {opp['tag_score']}% | "
-                                  f"**Path Score:** {opp['path_score']}%")
+                        st.markdown(f"**Score:** {opp['semantic_score']:.1f}% | "
+                                  f"**Tag Score:** {opp['tag_score']:.1f}% | "
+                                  f"**Path Score:** {opp['path_score']:.1f}%")
                         
                         if opp['common_tags']:
                             tags_display = ", ".join(opp['common_tags'])
                             st.markdown(f"**Common Tags:** {tags_display}")
                         st.markdown("---")
                 
-                csv = outbound_df.to_csv(index=False)
+                csv_data = rows_to_csv(outbound_rows)
                 st.download_button(
                     label="📥 Download Outbound (CSV)",
-                    data=csv,
+                    data=csv_data,
                     file_name="outbound_opportunities.csv",
                     mime="text/csv"
                 )
@@ -531,13 +908,8 @@ if st.sidebar.button("🔍 Analyze Internal Linking", type="primary", use_contai
             st.markdown("Pages that should link back to your new article:")
             
             if inbound:
-                inbound_df = pd.DataFrame([{
-                    'Title': opp['title'][:50] + '...' if len(opp['title']) > 50 else opp['title'],
-                    'URL': opp['url'],
-                    'Score': opp['semantic_score'],
-                    'Tag Score': opp['tag_score'],
-                    'Common Tags': ', '.join(opp['common_tags']) if opp['common_tags'] else '-'
-                } for opp in inbound])
+                inbound_rows = opportunity_rows(inbound)
+                inbound_df = pd.DataFrame(inbound_rows, columns=TABLE_COLUMNS)
                 
                 st.dataframe(inbound_df, use_container_width=True, hide_index=True)
                 
@@ -545,19 +917,19 @@ if st.sidebar.button("🔍 Analyze Internal Linking", type="primary", use_contai
                     for idx, opp in enumerate(inbound, 1):
                         st.markdown(f"### {idx}. {opp['title']}")
                         st.markdown(f"**URL:** `{opp['url']}`")
-                        st.markdown(f"**Score:** {opp['semantic_score']}% | "
-                                  f"**Tag Score:** {opp['tag_score']}% | "
-                                  f"**Path Score:** {opp['path_score']}%")
+                        st.markdown(f"**Score:** {opp['semantic_score']:.1f}% | "
+                                  f"**Tag Score:** {opp['tag_score']:.1f}% | "
+                                  f"**Path Score:** {opp['path_score']:.1f}%")
                         
                         if opp['common_tags']:
                             tags_display = ", ".join(opp['common_tags'])
                             st.markdown(f"**Common Tags:** {tags_display}")
                         st.markdown("---")
                 
-                csv = inbound_df.to_csv(index=False)
+                csv_data = rows_to_csv(inbound_rows)
                 st.download_button(
                     label="📥 Download Inbound (CSV)",
-                    data=csv,
+                    data=csv_data,
                     file_name="inbound_opportunities.csv",
                     mime="text/csv"
                 )
@@ -9,22 +9,55 @@ License: MIT
 
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+try:
+    import requests_cache
+except ImportError:
+    requests_cache = None  # type: ignore[assignment]
 import xml.etree.ElementTree as ET
+from io import BytesIO
 from urllib.parse import urlparse
 import pandas as pd
-from typing import List, Dict, Tuple, Set
+from typing import List, Dict, Tuple, Set, Optional, Iterator, Iterable, FrozenSet, Callable
 import re
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, MarkupResemblesLocatorWarning, XMLParsedAsHTMLWarning
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None  # type: ignore[misc,assignment]
 import time
 import json
+import orjson
 import numpy as np
 from datetime import datetime
-from collections import Counter
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
 import hashlib
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import os
+import tempfile
+import joblib
+import heapq
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from sklearn.feature_extraction.text import TfidfVectorizer, strip_accents_unicode
+from sklearn.metrics.pairwise import linear_kernel
+from scipy import sparse
+try:
+    import cudf
+    from cuml.feature_extraction.text import TfidfVectorizer as GpuTfidfVectorizer
+except ImportError:
+    GpuTfidfVectorizer = None
 import warnings
-warnings.filterwarnings('ignore')
+# Only silence the known-noisy categories; anything else (e.g. an empty TF-IDF vocabulary) stays visible
+warnings.filterwarnings('ignore', category=UserWarning, module='sklearn')
+warnings.filterwarnings('ignore', category=FutureWarning, module='sklearn')
+warnings.filterwarnings('ignore', category=XMLParsedAsHTMLWarning)
+warnings.filterwarnings('ignore', category=MarkupResemblesLocatorWarning)
 
 # Page configuration
 st.set_page_config(
@@ -38,19 +71,76 @@ st.set_page_config(
 # CONSTANTS
 # ============================================================================
 
-COMMON_WORDS = {
+COMMON_WORDS = frozenset({
     'index', 'page', 'article', 'post', 'blog', 'category', 'tag',
     'the', 'a', 'an', 'and', 'or', 'in', 'on', 'at', 'to', 'for', 'with',
     'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have', 'has', 'had',
     'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might'
-}
+})
+
+# Precompiled patterns used per page / per URL pair
+_TAG_CLASS_RE = re.compile(r'tag|label')
+_CONTENT_CLASS_RE = re.compile(r'content|post|article')
+_LOC_RE = re.compile(r'<loc>(https?://[^<]+)</loc>')
+_WORD_RE = re.compile(r'\b\w+\b')
 
 DEFAULT_RELEVANCE_SCORE = 30
 DEFAULT_TIMEOUT = 5
 MAX_TIMEOUT = 15
+MAX_BODY_WORDS = 1000  # Body text kept per page
+DEFAULT_FETCH_WORKERS = 16  # Concurrent page fetches
+MAX_FETCH_WORKERS = 32
+MAX_SITEMAP_DEPTH = 3  # Nested sitemap-index levels to follow
+SITEMAP_CACHE_TTL = 600  # Short, so newly published posts show up quickly
+GPU_TFIDF_MIN_DOCS = 5000  # Below this the GPU transfer costs more than the CPU fit
+TFIDF_CACHE_DIR = os.path.join(tempfile.gettempdir(), 'backlink_analyzer_tfidf')
+TFIDF_CACHE_MAX_FILES = 16  # Persisted TF-IDF fits kept; older ones are deleted (LRU by mtime)
+SIMILARITY_ROW_CACHE_SIZE = 256  # Dense similarity rows kept per analyzer (LRU)
+HTTP_CACHE_PATH = os.path.join(tempfile.gettempdir(), 'backlink_analyzer_http.sqlite')
+HTTP_CACHE_TTL = 3600  # Seconds before a cached page is revalidated
+THROTTLE_STATUS_CODES = (429, 503)  # Responses that mean "slow down"
+MAX_THROTTLE_RETRIES = 3
+MIN_BACKOFF = 0.5  # Seconds between requests to a host after its first 429/503
+MAX_BACKOFF = 30.0
 MAX_LINKS_PER_SILO = 2  # Diversity constraint
 DIVERSITY_PENALTY = 0.15  # 15% penalty for same-silo links after limit
 
+# TF-IDF configuration shared by the CPU and GPU vectorizers
+TFIDF_PARAMS = {
+    'max_features': 5000,  # Room for bigrams on larger sites; sparse rows keep this cheap
+    'stop_words': 'english',
+    'ngram_range': (1, 2),
+    'min_df': 2,
+    'max_df': 0.95,
+    'strip_accents': 'unicode',  # "café" and "cafe" are one term (applied before the fit on GPU)
+    'sublinear_tf': True,  # 1 + log(tf) damps long repetitive pages
+    'norm': 'l2',
+    'dtype': np.float32  # Plenty for cosine; halves the sparse matrix size
+}
+
+# Direction-specific factor weights used by the relevance scorers
+RELEVANCE_FACTORS = ('tag', 'content', 'path', 'depth', 'temporal', 'diversity')
+RELEVANCE_WEIGHTS = {
+    # For outbound: prioritize content relevance and established content
+    'outbound': {
+        'tag': 0.25,
+        'content': 0.35,
+        'path': 0.10,
+        'depth': 0.10,
+        'temporal': 0.10,
+        'diversity': 0.10
+    },
+    # For inbound: prioritize diverse sources and temporal relevance
+    'inbound': {
+        'tag': 0.20,
+        'content': 0.30,
+        'path': 0.10,
+        'depth': 0.10,
+        'temporal': 0.15,
+        'diversity': 0.15
+    }
+}
+
 # ============================================================================
 # STYLING & BRANDING
 # ============================================================================
@@ -86,48 +176,226 @@ st.markdown("**Advanced Semantic Analysis** • Differentiated linking strategie
 
 class ContentAnalyzer:
     """Advanced content analysis with TF-IDF and semantic similarity"""
-    
+
     def __init__(self):
         self.vectorizer = None
         self.tfidf_matrix = None
+        self.has_content = np.zeros(0, dtype=bool)
         self.urls = []
-        
-    def fit_content(self, content_dict: Dict[str, str]):
-        """Fit TF-IDF vectorizer on all content"""
-        self.urls = list(content_dict.keys())
-        texts = list(content_dict.values())
-        
-        if not texts or all(not t for t in texts):
+        self.url_to_idx = {}
+        self.url_rows = np.zeros(0, dtype=int)
+        self._row_cache = OrderedDict()
+        self._row_cache_lock = threading.Lock()
+
+    def fit_documents(self, urls: List[str], docs: Callable[[], Iterable[str]]):
+        """
+        Fit TF-IDF on a lazily produced corpus, one document per URL in `urls`
+
+        `docs` returns a fresh iterator over the documents on each call, so
+        the cache key and the vectorizer can both stream the corpus without
+        it ever being held in memory at once.
+        """
+        self.urls = list(urls)
+        self.url_to_idx = {u: i for i, u in enumerate(self.urls)}
+        self.url_rows = np.arange(len(self.urls))
+        self.has_content = np.zeros(len(self.urls), dtype=bool)
+        with self._row_cache_lock:
+            self._row_cache.clear()
+
+        if not self.urls or not any(docs()):
             return
-        
+
+        # Identical documents (duplicate pages, failed fetches) share one TF-IDF row;
+        # url_to_idx maps every URL onto its canonical row. The vocabulary and IDF are
+        # still fitted on every document, so duplicates count toward min_df / max_df
+        # exactly as they would without the dedup
+        row_of_hash: Dict[bytes, int] = {}
+        doc_rows: List[int] = []
+        canonical: List[bool] = []
+        for doc in docs():
+            doc_hash = hashlib.blake2b(doc.encode(), digest_size=8).digest()
+            row = row_of_hash.get(doc_hash)
+            canonical.append(row is None)
+            if row is None:
+                row = row_of_hash[doc_hash] = len(row_of_hash)
+            doc_rows.append(row)
+        self.url_to_idx = dict(zip(self.urls, doc_rows))
+        self.url_rows = np.array(doc_rows, dtype=int)
+        has_duplicates = len(row_of_hash) < len(self.urls)
+        unique_docs = lambda: (doc for doc, keep in zip(docs(), canonical) if keep)
+
         # Initialize TF-IDF with optimized parameters
-        self.vectorizer = TfidfVectorizer(
-            max_features=500,
-            stop_words='english',
-            ngram_range=(1, 2),
-            min_df=2,
-            max_df=0.8
-        )
-        
+        self.vectorizer = TfidfVectorizer(**TFIDF_PARAMS)
+        use_gpu = GpuTfidfVectorizer is not None and len(self.urls) >= GPU_TFIDF_MIN_DOCS
+
+        cache_path = self._cache_path(docs(), 'cuml' if use_gpu else 'sklearn')
+        if self._load(cache_path):
+            self.has_content = np.diff(self.tfidf_matrix.indptr) > 0
+            return
+
+        if use_gpu:
+            try:
+                self.tfidf_matrix = self._fit_transform_gpu(
+                    list(docs()), list(unique_docs()) if has_duplicates else None
+                )
+                # The fitted model stays on the device; nothing transforms new text afterwards
+                self.vectorizer = None
+            except Exception:
+                # The GPU only speeds the fit up; any cuML/CUDA failure falls back to the CPU
+                use_gpu = False
+                cache_path = self._cache_path(docs(), 'sklearn')
+        if not use_gpu:
+            try:
+                if has_duplicates:
+                    self.vectorizer.fit(docs())
+                    self.tfidf_matrix = self.vectorizer.transform(unique_docs())
+                else:
+                    self.tfidf_matrix = self.vectorizer.fit_transform(docs())
+            except:
+                self.tfidf_matrix = None
+                return
+
+        # norm='l2' already leaves every row unit-length, so the dot product equals
+        # cosine similarity without another normalization pass
+        self.tfidf_matrix = sparse.csr_matrix(self.tfidf_matrix)
+        # Rows with no vocabulary terms (empty or failed pages) have zero similarity to everything
+        self.has_content = np.diff(self.tfidf_matrix.indptr) > 0
+        self._save(cache_path)
+
+    def _fit_transform_gpu(self, texts: List[str], unique_texts: Optional[List[str]] = None):
+        """
+        Fit TF-IDF on the GPU with cuML and return the matrix as a SciPy CSR
+
+        The fit sees every text; only `unique_texts` (all of them when None)
+        are transformed. Only the fit runs on the device; the result is copied
+        back once, since per-query similarity rows are single sparse GEMVs
+        that are cheap on CPU.
+        """
+        # cuML has no strip_accents option, so accents are stripped up front to match sklearn
+        gpu_params = {k: v for k, v in TFIDF_PARAMS.items() if k != 'strip_accents'}
+        gpu_vectorizer = GpuTfidfVectorizer(**gpu_params)
+        corpus = cudf.Series([strip_accents_unicode(text) for text in texts])
+        if unique_texts is None:
+            return gpu_vectorizer.fit_transform(corpus).get()
+        gpu_vectorizer.fit(corpus)
+        return gpu_vectorizer.transform(cudf.Series([strip_accents_unicode(text) for text in unique_texts])).get()
+
+    def _cache_path(self, texts: Iterable[str], backend: str = 'sklearn') -> str:
+        """Location of the persisted fit for this corpus, vectorizer configuration and backend"""
+        digest = hashlib.sha1(repr(('dedup-full-df', backend, sorted(self.vectorizer.get_params().items()))).encode())
+        for url, text in zip(self.urls, texts):
+            digest.update(url.encode())
+            digest.update(b'\0')
+            digest.update(text.encode())
+            digest.update(b'\0')
+        return os.path.join(TFIDF_CACHE_DIR, f"tfidf_{digest.hexdigest()[:16]}.joblib")
+
+    def _load(self, path: str) -> bool:
+        """Restore a persisted fit; the sparse arrays are memory-mapped, not copied"""
+        if not os.path.exists(path):
+            return False
         try:
-            self.tfidf_matrix = self.vectorizer.fit_transform(texts)
-        except:
-            self.tfidf_matrix = None
+            self.vectorizer, self.tfidf_matrix = joblib.load(path, mmap_mode='r')
+        except Exception:
+            return False
+        try:
+            # Mark as recently used so eviction keeps it
+            os.utime(path)
+        except OSError:
+            pass
+        return True
+
+    def _save(self, path: str):
+        """Persist the fit uncompressed so it can be memory-mapped on load"""
+        try:
+            os.makedirs(TFIDF_CACHE_DIR, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            joblib.dump((self.vectorizer, self.tfidf_matrix), tmp_path, compress=0)
+            os.replace(tmp_path, path)
+        except Exception:
+            pass
+        evict_tfidf_cache()
+
+    def similarity_row(self, idx: int) -> np.ndarray:
+        """
+        Cosine similarity of one row against every row
+
+        The analyzer is shared across sessions, so only the most recently used
+        SIMILARITY_ROW_CACHE_SIZE rows are kept.
+        """
+        with self._row_cache_lock:
+            row = self._row_cache.get(idx)
+            if row is not None:
+                self._row_cache.move_to_end(idx)
+                return row
+        # One sparse GEMV; rows are L2-normalized so the linear kernel is cosine
+        row = linear_kernel(self.tfidf_matrix[idx], self.tfidf_matrix).ravel()
+        with self._row_cache_lock:
+            self._row_cache[idx] = row
+            if len(self._row_cache) > SIMILARITY_ROW_CACHE_SIZE:
+                self._row_cache.popitem(last=False)
+        return row
+
+    def score_against(self, url: str) -> np.ndarray:
+        """Cosine similarity of one URL against every fitted URL, aligned with self.urls"""
+        idx = self.url_to_idx.get(url)
+        if self.tfidf_matrix is None or idx is None:
+            return np.zeros(len(self.urls))
+        return self.similarity_row(idx)[self.url_rows]
+
+
+def evict_tfidf_cache(max_files: int = TFIDF_CACHE_MAX_FILES):
+    """Delete all but the `max_files` most recently used TF-IDF fits in TFIDF_CACHE_DIR"""
+    try:
+        entries = [
+            entry for entry in os.scandir(TFIDF_CACHE_DIR)
+            if entry.name.startswith('tfidf_') and entry.name.endswith('.joblib')
+        ]
+    except OSError:
+        return
+    entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    for entry in entries[max_files:]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+
+def iter_documents(urls: List[str], content_cache: Dict) -> Iterator[str]:
+    """Yield the TF-IDF document (title, description, headings, body) for each URL"""
+    for url in urls:
+        content = content_cache.get(url, {})
+        yield ' '.join([
+            content.get('title', ''),
+            content.get('description', ''),
+            ' '.join(content.get('headings', [])),
+            content.get('body_text', '')
+        ])
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def build_analyzer(
+    corpus_key: Tuple[Tuple[str, str], ...],
+    _urls: List[str],
+    _content_cache: Dict
+) -> ContentAnalyzer:
+    """
+    Fitted ContentAnalyzer for a corpus, shared across reruns and sessions
     
-    def get_similarity(self, url1: str, url2: str) -> float:
-        """Calculate cosine similarity between two URLs"""
-        if self.tfidf_matrix is None or url1 not in self.urls or url2 not in self.urls:
-            return 0.0
-        
-        idx1 = self.urls.index(url1)
-        idx2 = self.urls.index(url2)
-        
-        similarity = cosine_similarity(
-            self.tfidf_matrix[idx1:idx1+1],
-            self.tfidf_matrix[idx2:idx2+1]
-        )[0][0]
-        
-        return float(similarity * 100)  # Convert to percentage
+    `corpus_key` is a tuple of (url, sha1(document)) pairs; the content
+    itself is passed unhashed, so an unchanged corpus skips fitting entirely.
+    """
+    content_analyzer = ContentAnalyzer()
+    content_analyzer.fit_documents(_urls, lambda: iter_documents(_urls, _content_cache))
+    return content_analyzer
+
+
+def make_corpus_key(urls: List[str], content_cache: Dict) -> Tuple[Tuple[str, str], ...]:
+    """Hashable cache key for build_analyzer()"""
+    return tuple(
+        (url, hashlib.sha1(doc.encode()).hexdigest())
+        for url, doc in zip(urls, iter_documents(urls, content_cache))
+    )
 
 
 def extract_silo_from_url(url: str) -> str:
@@ -141,150 +409,472 @@ def extract_silo_from_url(url: str) -> str:
     return 'root'
 
 
+def parse_sitemap(content: bytes) -> Tuple[bool, List[str]]:
+    """
+    Stream-parse sitemap XML into (is_sitemap_index, <loc> URLs)
+    
+    Each element is cleared once it has been read so memory stays flat
+    regardless of sitemap size. Raises ET.ParseError on malformed XML.
+    """
+    ns_loc_tag = '{http://www.sitemaps.org/schemas/sitemap/0.9}loc'
+    is_index = None
+    ns_urls = []
+    plain_urls = []
+    for event, elem in ET.iterparse(BytesIO(content), events=('start', 'end')):
+        if event == 'start':
+            if is_index is None:
+                is_index = elem.tag.rsplit('}', 1)[-1] == 'sitemapindex'
+            continue
+        if elem.tag == ns_loc_tag and elem.text:
+            ns_urls.append(elem.text)
+        elif elem.tag == 'loc' and elem.text:
+            plain_urls.append(elem.text)
+        elem.clear()
+    return bool(is_index), ns_urls or plain_urls
+
+
+class PartialSitemapError(Exception):
+    """Some sitemaps listed in a sitemap index failed to load; `urls` holds the pages that did"""
+
+    def __init__(self, failed: List[str], urls: List[str]):
+        super().__init__(f"{len(failed)} sitemap(s) could not be loaded: {', '.join(failed)}")
+        self.failed = failed
+        self.urls = urls
+
+
+def _fetch_child_sitemap(session: requests.Session, sitemap_url: str) -> Tuple[bool, List[str]]:
+    """Fetch and parse one sitemap referenced from a sitemap index; request errors propagate"""
+    response = session.get(sitemap_url, timeout=10)
+    response.raise_for_status()
+    try:
+        return parse_sitemap(response.content)
+    except ET.ParseError:
+        return False, _LOC_RE.findall(response.text)
+
+
+def expand_sitemap_index(sitemap_urls: List[str]) -> List[str]:
+    """
+    Collect page URLs from the sitemaps listed in a sitemap index
+    
+    Ghost serves /sitemap.xml as an index of per-type sitemaps (posts, pages,
+    tags, ...). Each level of the index is fetched concurrently; nested
+    indexes are followed up to MAX_SITEMAP_DEPTH levels. If any sitemap
+    fails to load, PartialSitemapError is raised after the rest are
+    collected, so an incomplete URL list is never cached.
+    """
+    urls: List[str] = []
+    failed: List[str] = []
+    seen = set(sitemap_urls)
+    pending = list(sitemap_urls)
+    with requests.Session() as session:
+        for _ in range(MAX_SITEMAP_DEPTH):
+            if not pending:
+                break
+            with ThreadPoolExecutor(max_workers=min(DEFAULT_FETCH_WORKERS, len(pending))) as executor:
+                futures = [executor.submit(_fetch_child_sitemap, session, url) for url in pending]
+            
+            nested: List[str] = []
+            for url, future in zip(pending, futures):
+                try:
+                    is_index, locs = future.result()
+                except Exception:
+                    failed.append(url)
+                    continue
+                (nested if is_index else urls).extend(locs)
+            pending = [url for url in nested if url not in seen]
+            seen.update(pending)
+    if failed:
+        raise PartialSitemapError(failed, [url for url in urls if url])
+    return urls
+
+
+@st.cache_data(ttl=SITEMAP_CACHE_TTL, show_spinner=False)
+def _load_sitemap(sitemap_url: str) -> Tuple[List[str], bool]:
+    """
+    Fetch and parse a sitemap, expanding sitemap indexes; cached across reruns
+    
+    Returns (urls, recovered_by_pattern_matching). Errors propagate so that
+    failed fetches are not cached.
+    """
+    response = requests.get(sitemap_url, timeout=10)
+    response.raise_for_status()
+    
+    try:
+        is_index, urls = parse_sitemap(response.content)
+    except ET.ParseError:
+        # Fallback to regex extraction
+        return _LOC_RE.findall(response.text), True
+    
+    if is_index:
+        urls = expand_sitemap_index(urls)
+    
+    return [url for url in urls if url], False
+
+
 def fetch_sitemap(sitemap_url: str) -> List[str]:
-    """Fetch URLs from sitemap.xml with robust error handling"""
+    """Fetch URLs from sitemap.xml (or a sitemap index) with robust error handling"""
     try:
-        response = requests.get(sitemap_url, timeout=10)
-        response.raise_for_status()
-        
-        # Try to parse as XML
-        try:
-            root = ET.fromstring(response.content)
-        except ET.ParseError as e:
-            # Fallback to regex extraction
-            content = response.text
-            urls = re.findall(r'<loc>(https?://[^<]+)</loc>', content)
-            if urls:
-                st.success(f"✅ Recovered {len(urls)} URLs using pattern matching")
-                return urls
-            else:
-                st.error(f"❌ Could not parse sitemap")
-                return []
-        
-        # Handle namespace
-        namespace = {'ns': 'http://www.sitemaps.org/schemas/sitemap/0.9'}
-        urls = [loc.text for loc in root.findall('.//ns:loc', namespace) if loc.text]
-        
-        if not urls:
-            urls = [loc.text for loc in root.findall('.//loc') if loc.text]
-        
-        urls = [url for url in urls if url]
-        
-        if urls:
-            st.success(f"✅ Successfully fetched {len(urls)} URLs from sitemap")
-        
-        return urls
-        
+        urls, recovered = _load_sitemap(sitemap_url)
+    except PartialSitemapError as e:
+        # Not cached, so the failed sitemaps are retried on the next run
+        st.warning(f"⚠️ {e}. Pages listed only there are missing from this analysis.")
+        urls, recovered = e.urls, False
     except Exception as e:
         st.error(f"❌ Error fetching sitemap: {str(e)}")
         return []
+    
+    if recovered:
+        if urls:
+            st.success(f"✅ Recovered {len(urls)} URLs using pattern matching")
+        else:
+            st.error(f"❌ Could not parse sitemap")
+        return urls
+    
+    if urls:
+        st.success(f"✅ Successfully fetched {len(urls)} URLs from sitemap")
+    
+    return urls
+
 
+def _first_words(strings: Iterable[str], limit: int = MAX_BODY_WORDS) -> str:
+    """Join the first `limit` whitespace-separated words, stopping as soon as they are collected"""
+    words = []
+    for text in strings:
+        words.extend(text.split())
+        if len(words) >= limit:
+            break
+    return ' '.join(words[:limit])
 
-def fetch_page_content(url: str, timeout: int = DEFAULT_TIMEOUT) -> Dict:
+
+def _loads_json(text: str):
+    """Parse JSON with orjson, falling back to json for the non-standard input it rejects (NaN, Infinity)"""
+    try:
+        return orjson.loads(text)
+    except orjson.JSONDecodeError:
+        return json.loads(text)
+
+
+def _jsonld_keywords(script_text: str) -> List[str]:
+    """Keywords from one Schema.org JSON-LD block (only blocks that can carry keywords are parsed)"""
+    if 'keywords' not in script_text:
+        return []
+    try:
+        data = _loads_json(script_text)
+        if isinstance(data, dict) and 'keywords' in data:
+            keywords = data['keywords']
+            if isinstance(keywords, str):
+                return [k.strip() for k in keywords.split(',')]
+            elif isinstance(keywords, list):
+                return keywords
+    except:
+        pass
+    return []
+
+
+def _extract_fields_selectolax(html: bytes) -> Tuple[str, str, List[str], List[str], str, Optional[str]]:
     """
-    Enhanced content extraction including title, description, tags, headings, and body text
+    Extract (title, description, raw tags, headings, body text, date string)
+    with selectolax's Lexbor engine
+    
+    CSS selectors only build Python node objects for the elements they match.
+    Selector lists return matches in document order, like the BeautifulSoup walk.
     """
-    try:
-        response = requests.get(url, timeout=timeout)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Extract title
-        title_elem = soup.find('meta', {'property': 'og:title'}) or soup.find('title')
-        title = (
-            title_elem.get('content')
-            if title_elem and title_elem.get('content')
-            else (title_elem.get_text(strip=True) if title_elem else "")
+    tree = LexborHTMLParser(html)
+    
+    # Extract title
+    title_elem = tree.css_first('meta[property="og:title"]') or tree.css_first('title')
+    title = ""
+    if title_elem:
+        title = title_elem.attributes.get('content') or title_elem.text(strip=True)
+    
+    # Extract description
+    desc_elem = tree.css_first('meta[name="description"]')
+    description = (desc_elem.attributes.get('content') or "") if desc_elem else ""
+    
+    # Extract tags
+    tags = []
+    
+    # Method 1: Meta keywords
+    meta_keywords = tree.css_first('meta[name="keywords"]')
+    keywords_content = meta_keywords.attributes.get('content') if meta_keywords else None
+    if keywords_content:
+        tags.extend([t.strip() for t in keywords_content.split(',')])
+    
+    # Method 2: Schema.org JSON-LD
+    for script in tree.css('script[type="application/ld+json"]'):
+        tags.extend(_jsonld_keywords(script.text()))
+    
+    # Method 3: Tag links
+    for tag in tree.css('a[class*="tag"], a[class*="label"]'):
+        tag_text = tag.text(strip=True)
+        if tag_text and len(tag_text) < 50:
+            tags.append(tag_text)
+    
+    headings = [h.text(strip=True) for h in tree.css('h1, h2, h3')]
+    headings = [h for h in headings if h]
+    
+    # Extract publish date if available
+    date_elem = tree.css_first('meta[property="article:published_time"]') or tree.css_first('time[datetime]')
+    date_str = None
+    if date_elem:
+        date_str = date_elem.attributes.get('content') or date_elem.attributes.get('datetime')
+    
+    # Extract body text (limit to main content), without script and style elements
+    tree.strip_tags(['script', 'style'])
+    main_content = (
+        tree.css_first('main')
+        or tree.css_first('article')
+        or tree.css_first('div[class*="content"], div[class*="post"], div[class*="article"]')
+        or tree.root
+    )
+    body_text = ""
+    if main_content:
+        body_text = _first_words(
+            node.text_content for node in main_content.traverse(include_text=True)
+            if node.is_text_node and node.text_content
         )
-        
-        # Extract description
-        desc_elem = soup.find('meta', {'name': 'description'})
-        description = desc_elem.get('content', '') if desc_elem else ""
-        
-        # Extract tags
-        tags = []
-        
-        # Method 1: Meta keywords
-        meta_keywords = soup.find('meta', {'name': 'keywords'})
-        if meta_keywords and meta_keywords.get('content'):
-            tags.extend([t.strip() for t in meta_keywords['content'].split(',')])
-        
-        # Method 2: Schema.org JSON-LD
-        script_tags = soup.find_all('script', {'type': 'application/ld+json'})
-        for script in script_tags:
-            try:
-                data = json.loads(script.string)
-                if isinstance(data, dict) and 'keywords' in data:
-                    keywords = data['keywords']
-                    if isinstance(keywords, str):
-                        tags.extend([k.strip() for k in keywords.split(',')])
-                    elif isinstance(keywords, list):
-                        tags.extend(keywords)
-            except:
-                pass
-        
-        # Method 3: Tag links
-        tag_links = soup.find_all('a', {'class': re.compile(r'tag|label')})
-        for tag in tag_links:
-            tag_text = tag.get_text(strip=True)
-            if tag_text and len(tag_text) < 50:
-                tags.append(tag_text)
-        
-        # Clean tags
-        tags = list(set([t.lower().strip() for t in tags if t and len(t.strip()) > 0]))
-        
-        # Extract headings
-        headings = []
-        for h_tag in soup.find_all(['h1', 'h2', 'h3']):
-            heading_text = h_tag.get_text(strip=True)
+    
+    return title, description, tags, headings, body_text, date_str
+
+
+def _extract_fields_bs4(html: bytes) -> Tuple[str, str, List[str], List[str], str, Optional[str]]:
+    """
+    Extract (title, description, raw tags, headings, body text, date string)
+    with BeautifulSoup, used when selectolax is not installed or fails on a page
+    """
+    soup = BeautifulSoup(html, 'lxml')
+    
+    # Walk the document once and pick out every element we need,
+    # keeping the first match where the old per-field find() did
+    og_title_elem = title_tag = desc_elem = meta_keywords = published_elem = time_elem = None
+    main_elem = article_elem = content_div = None
+    script_tags = []
+    tag_links = []
+    headings = []
+    strip_elems = []
+    
+    for elem in soup.find_all(['meta', 'title', 'h1', 'h2', 'h3', 'time', 'script', 'style',
+                               'a', 'main', 'article', 'div']):
+        name = elem.name
+        if name == 'meta':
+            meta_property = elem.get('property')
+            meta_name = elem.get('name')
+            if meta_property == 'og:title' and og_title_elem is None:
+                og_title_elem = elem
+            elif meta_property == 'article:published_time' and published_elem is None:
+                published_elem = elem
+            if meta_name == 'description' and desc_elem is None:
+                desc_elem = elem
+            elif meta_name == 'keywords' and meta_keywords is None:
+                meta_keywords = elem
+        elif name in ('h1', 'h2', 'h3'):
+            heading_text = elem.get_text(strip=True)
             if heading_text:
                 headings.append(heading_text)
-        
-        # Extract body text (limit to main content)
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-        
-        # Try to find main content area
-        main_content = soup.find('main') or soup.find('article') or soup.find('div', class_=re.compile('content|post|article'))
-        
-        if main_content:
-            body_text = main_content.get_text(separator=' ', strip=True)
-        else:
-            body_text = soup.get_text(separator=' ', strip=True)
-        
-        # Limit body text to reasonable length
-        body_text = ' '.join(body_text.split()[:1000])
-        
-        # Extract publish date if available
-        date_elem = soup.find('meta', {'property': 'article:published_time'}) or \
-                   soup.find('time', {'datetime': True})
-        
-        publish_date = None
-        if date_elem:
-            date_str = date_elem.get('content') or date_elem.get('datetime')
-            if date_str:
-                try:
-                    publish_date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                except:
-                    pass
-        
-        # Calculate content depth metrics
-        word_count = len(body_text.split())
-        heading_count = len(headings)
-        
-        return {
-            'title': title,
-            'description': description,
-            'tags': tags,
-            'headings': headings,
-            'body_text': body_text,
-            'word_count': word_count,
-            'heading_count': heading_count,
-            'publish_date': publish_date,
-            'silo': extract_silo_from_url(url)
-        }
-        
+        elif name == 'a':
+            if any(_TAG_CLASS_RE.search(c) for c in elem.get('class') or []):
+                tag_links.append(elem)
+        elif name == 'div':
+            if content_div is None and any(_CONTENT_CLASS_RE.search(c) for c in elem.get('class') or []):
+                content_div = elem
+        elif name == 'script':
+            if elem.get('type') == 'application/ld+json':
+                script_tags.append(elem)
+            strip_elems.append(elem)
+        elif name == 'style':
+            strip_elems.append(elem)
+        elif name == 'title' and title_tag is None:
+            title_tag = elem
+        elif name == 'time' and time_elem is None and elem.has_attr('datetime'):
+            time_elem = elem
+        elif name == 'main' and main_elem is None:
+            main_elem = elem
+        elif name == 'article' and article_elem is None:
+            article_elem = elem
+    
+    # Extract title
+    title_elem = og_title_elem or title_tag
+    title = (
+        str(title_elem.get('content'))
+        if title_elem and title_elem.get('content')
+        else (title_elem.get_text(strip=True) if title_elem else "")
+    )
+    
+    # Extract description
+    description = str(desc_elem.get('content', '')) if desc_elem else ""
+    
+    # Extract tags
+    tags = []
+    
+    # Method 1: Meta keywords
+    if meta_keywords and meta_keywords.get('content'):
+        tags.extend([t.strip() for t in meta_keywords['content'].split(',')])
+    
+    # Method 2: Schema.org JSON-LD
+    for script in script_tags:
+        tags.extend(_jsonld_keywords(str(script.string or '')))
+    
+    # Method 3: Tag links
+    for tag in tag_links:
+        tag_text = tag.get_text(strip=True)
+        if tag_text and len(tag_text) < 50:
+            tags.append(tag_text)
+    
+    # Extract body text (limit to main content)
+    # Remove script and style elements
+    for elem in strip_elems:
+        elem.decompose()
+    
+    # Try to find main content area
+    main_content = main_elem or article_elem or content_div
+    
+    body_text = _first_words((main_content or soup).stripped_strings)
+    
+    # Extract publish date if available
+    date_elem = published_elem or time_elem
+    date_value = (date_elem.get('content') or date_elem.get('datetime')) if date_elem else None
+    date_str = str(date_value) if date_value is not None else None
+    
+    return title, description, tags, headings, body_text, date_str
+
+
+class HostRateLimiter:
+    """
+    Per-host request pacing that only kicks in once a host pushes back
+    
+    Hosts start unthrottled. A 429/503 sets a minimum interval between
+    requests to that host (Retry-After if given, otherwise doubling from
+    MIN_BACKOFF); each successful response halves it again.
+    """
+    
+    def __init__(self):
+        self.interval = {}
+        self.next_allowed = {}
+        self.lock = threading.Lock()
+    
+    def wait(self, host: str):
+        """Block until the next request to `host` is allowed and reserve its slot"""
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_allowed.get(host, 0.0))
+            self.next_allowed[host] = slot + self.interval.get(host, 0.0)
+        if slot > now:
+            time.sleep(slot - now)
+    
+    def throttled(self, host: str, retry_after: Optional[float] = None):
+        """Back off after a 429/503 from `host`"""
+        with self.lock:
+            backoff = max(MIN_BACKOFF, self.interval.get(host, 0.0) * 2, retry_after or 0.0)
+            self.interval[host] = min(MAX_BACKOFF, backoff)
+            self.next_allowed[host] = time.monotonic() + self.interval[host]
+    
+    def succeeded(self, host: str):
+        """Relax pacing for `host` after a normal response"""
+        with self.lock:
+            interval = self.interval.get(host)
+            if interval is None:
+                return
+            if interval / 2 < MIN_BACKOFF:
+                del self.interval[host]
+            else:
+                self.interval[host] = interval / 2
+
+
+RATE_LIMITER = HostRateLimiter()
+
+
+def _retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """Parse a Retry-After header given either as seconds or as an HTTP date"""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(retry_at.tzinfo)).total_seconds())
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _fetch_page_content_cached(
+    url: str,
+    timeout: int = DEFAULT_TIMEOUT,
+    _session: Optional[requests.Session] = None
+) -> Dict:
+    """
+    Fetch and extract one page; cached per (url, timeout) across Streamlit reruns
+    
+    Errors propagate so that failed fetches are not cached. Hosts answering
+    429/503 are backed off through RATE_LIMITER and retried.
+    """
+    session = _session or SESSION
+    host = urlparse(url).netloc
+    for attempt in range(MAX_THROTTLE_RETRIES + 1):
+        RATE_LIMITER.wait(host)
+        response = session.get(url, timeout=timeout)
+        if response.status_code not in THROTTLE_STATUS_CODES:
+            RATE_LIMITER.succeeded(host)
+            break
+        RATE_LIMITER.throttled(host, _retry_after_seconds(response))
+        response.close()
+    try:
+        response.raise_for_status()
+    except requests.HTTPError:
+        response.close()
+        raise
+    
+    # Lexbor handles nearly everything; BeautifulSoup is kept for pages it cannot parse
+    fields = None
+    if LexborHTMLParser is not None:
+        try:
+            fields = _extract_fields_selectolax(response.content)
+        except Exception:
+            fields = None
+    if fields is None:
+        fields = _extract_fields_bs4(response.content)
+    title, description, tags, headings, body_text, date_str = fields
+    
+    # Clean tags
+    tags = list(set([t.lower().strip() for t in tags if t and len(t.strip()) > 0]))
+    
+    publish_date = None
+    if date_str:
+        try:
+            publish_date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+        except:
+            pass
+    
+    # Calculate content depth metrics
+    word_count = len(body_text.split())
+    heading_count = len(headings)
+    
+    return {
+        'title': title,
+        'description': description,
+        'tags': tags,
+        'headings': headings,
+        'body_text': body_text,
+        'word_count': word_count,
+        'heading_count': heading_count,
+        'publish_date': publish_date,
+        'silo': extract_silo_from_url(url)
+    }
+
+
+def fetch_page_content(
+    url: str,
+    timeout: int = DEFAULT_TIMEOUT,
+    session: Optional[requests.Session] = None
+) -> Dict:
+    """
+    Enhanced content extraction including title, description, tags, headings, and body text
+    """
+    try:
+        return _fetch_page_content_cached(url, timeout, session)
     except Exception as e:
         return {
             'title': '',
@@ -299,142 +889,248 @@ def fetch_page_content(url: str, timeout: int = DEFAULT_TIMEOUT) -> Dict:
         }
 
 
-def calculate_enhanced_relevance(
-    url1: str,
-    url2: str,
+@st.cache_resource(show_spinner=False)
+def get_session() -> requests.Session:
+    """
+    Shared HTTP session for page fetches, created once per server process
+    
+    With requests-cache installed, responses persist in SQLite across runs;
+    stale entries are revalidated with ETag / Last-Modified, so unchanged
+    pages come back as a 304 with no body. The connection pool is sized for
+    the largest worker count, since the default of 10 connections per host
+    would make extra workers open and drop a fresh connection (and TLS
+    handshake) on every request. Transient 5xx errors are retried by the
+    adapter; 429/503 are left to RATE_LIMITER, which honors Retry-After per host.
+    """
+    if requests_cache is not None:
+        session = requests_cache.CachedSession(
+            HTTP_CACHE_PATH,
+            backend='sqlite',
+            expire_after=HTTP_CACHE_TTL,
+            cache_control=True
+        )
+    else:
+        session = requests.Session()
+    retries = Retry(
+        total=2,
+        backoff_factor=0.3,
+        status_forcelist=[500, 502, 504],
+        respect_retry_after_header=False,  # 429/503 + Retry-After go through RATE_LIMITER
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=MAX_FETCH_WORKERS, pool_maxsize=MAX_FETCH_WORKERS, max_retries=retries)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+SESSION = get_session()
+
+
+def fetch_all_pages(
+    urls: List[str],
+    timeout: int = DEFAULT_TIMEOUT,
+    max_workers: int = DEFAULT_FETCH_WORKERS
+) -> Iterator[Tuple[str, Dict]]:
+    """
+    Fetch page content for many URLs concurrently
+    
+    Page fetching is network-bound, so a thread pool overlaps the request
+    latency, and the shared SESSION reuses keep-alive connections to the host.
+    Yields (url, content) pairs in completion order, so one slow page does
+    not hold back progress reporting for the rest.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(fetch_page_content, url, timeout, SESSION): url for url in urls}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def extract_path(url: str) -> str:
+    """Extract path from URL without domain"""
+    parsed = urlparse(url)
+    return parsed.path.strip('/')
+
+
+@lru_cache(maxsize=65536)
+def extract_path_words(url: str) -> FrozenSet[str]:
+    """Meaningful (non-common) words in a URL path; memoized per URL"""
+    return frozenset(_WORD_RE.findall(extract_path(url).lower())).difference(COMMON_WORDS)
+
+
+def precompute_path_features(urls: Iterable[str]) -> Dict[str, FrozenSet[str]]:
+    """Map each URL to its meaningful path words, parsed once per URL"""
+    return {url: extract_path_words(url) for url in urls}
+
+
+def build_bitsets(item_sets: List[FrozenSet[str]]) -> np.ndarray:
+    """
+    Encode each string set (tags, path words) as a row of packed uint64 bitmasks
+    over the combined vocabulary
+    
+    The overlap of two rows is popcount(a & b) and their union popcount(a | b),
+    so one query can be compared against every URL with broadcast bit ops
+    instead of Python set intersections.
+    """
+    vocab = {item: i for i, item in enumerate(sorted(set().union(*item_sets)))}
+    n_words = max(1, -(-len(vocab) // 64))
+    
+    incidence = np.zeros((len(item_sets), n_words * 64), dtype=bool)
+    rows = [row for row, items in enumerate(item_sets) for _ in items]
+    cols = [vocab[item] for items in item_sets for item in items]
+    incidence[rows, cols] = True
+    
+    return np.packbits(incidence, axis=1, bitorder='little').view(np.uint64)
+
+
+def build_feature_arrays(
+    urls: List[str],
     content_cache: Dict,
-    content_analyzer: ContentAnalyzer,
-    link_direction: str = 'outbound'
+    content_analyzer: ContentAnalyzer
 ) -> Dict:
     """
-    Enhanced relevance calculation with multiple factors
-    
-    Factors considered:
-    - Tag overlap (30%)
-    - Content similarity via TF-IDF (30%)
-    - URL path similarity (10%)
-    - Content depth alignment (10%)
-    - Temporal relevance (10%)
-    - Silo diversity (10%)
+    Pack per-URL features into parallel arrays (one row per URL) so a single
+    URL can be scored against every other URL with vectorized NumPy ops
     """
+    n = len(urls)
+    cached = [content_cache.get(url, {}) for url in urls]
+    dates = [content.get('publish_date') for content in cached]
+    path_words = precompute_path_features(urls)
+    tag_sets = [frozenset(content.get('tags', [])) for content in cached]
+    silos = [content.get('silo', 'root') for content in cached]
     
-    content1 = content_cache.get(url1, {})
-    content2 = content_cache.get(url2, {})
+    # Intern silo names so same-silo checks compare small ints, not strings
+    silo_index: Dict[str, int] = {}
+    silo_ids = np.fromiter((silo_index.setdefault(silo, len(silo_index)) for silo in silos),
+                           dtype=np.int32, count=n)
     
-    # 1. Tag-based similarity
-    tags1 = set(content1.get('tags', []))
-    tags2 = set(content2.get('tags', []))
+    return {
+        'urls': urls,
+        'word_counts': np.fromiter((content.get('word_count', 0) for content in cached),
+                                   dtype=np.int32, count=n),
+        'silos': silos,
+        'silo_ids': silo_ids,
+        'has_date': np.fromiter((bool(date) for date in dates), dtype=bool, count=n),
+        # Microseconds since the epoch; only compared, so integer ticks keep ordering exact
+        'timestamps': np.fromiter((round(date.timestamp() * 1e6) if date else 0 for date in dates),
+                                  dtype=np.int64, count=n),
+        'tag_sets': tag_sets,
+        'tag_bits': build_bitsets(tag_sets),
+        'path_words': [path_words[url] for url in urls],
+        'path_bits': build_bitsets([path_words[url] for url in urls]),
+        'tfidf_rows': np.array([content_analyzer.url_to_idx.get(url, -1) for url in urls], dtype=int)
+    }
+
+
+def precompute_features(
+    new_url: str,
+    all_urls: List[str],
+    content_cache: Dict,
+    content_analyzer: ContentAnalyzer
+) -> Dict:
+    """
+    Feature arrays for the sitemap plus the new article, built once and
+    shared by the outbound and inbound finders
+    """
+    urls = all_urls if new_url in all_urls else all_urls + [new_url]
+    return build_feature_arrays(urls, content_cache, content_analyzer)
+
+
+def calculate_enhanced_relevance_batch(
+    query_idx: int,
+    features: Dict,
+    content_analyzer: ContentAnalyzer,
+    link_direction: str = 'outbound'
+) -> Dict:
+    """
+    Enhanced relevance of one URL against all URLs, with multiple factors
     
-    tag_intersection = len(tags1 & tags2)
-    if tag_intersection > 0:
-        tag_score = min(100, 30 + (tag_intersection * 25))
-    else:
-        tag_score = 0
+    Factors considered (weights per direction in RELEVANCE_WEIGHTS):
+    - Tag overlap
+    - Content similarity via TF-IDF
+    - URL path similarity
+    - Content depth alignment
+    - Temporal relevance
+    - Silo diversity
     
-    # 2. Content similarity (TF-IDF)
-    content_score = content_analyzer.get_similarity(url1, url2)
+    The query row is the source for outbound links and the target for
+    inbound links. Returns one array per factor, aligned with features['urls'].
+    Common tags are left to the caller so they are only built for kept candidates.
+    """
+    n = len(features['urls'])
     
-    # 3. URL path similarity
-    path1 = extract_path(url1).lower()
-    path2 = extract_path(url2).lower()
+    # 1. Tag-based similarity (popcount of the shared tag bits)
+    tag_bits = features['tag_bits']
+    tag_intersection = np.bitwise_count(tag_bits & tag_bits[query_idx]).sum(axis=1)
+    tag_scores = np.where(tag_intersection > 0, np.minimum(100, 30 + tag_intersection * 25), 0)
     
-    words1 = set(re.findall(r'\b\w+\b', path1)) - COMMON_WORDS
-    words2 = set(re.findall(r'\b\w+\b', path2)) - COMMON_WORDS
+    # 2. Content similarity (TF-IDF) - one row of the similarity matrix
+    content_scores = np.zeros(n)
+    rows = features['tfidf_rows']
+    if (content_analyzer.tfidf_matrix is not None and rows[query_idx] >= 0
+            and content_analyzer.has_content[rows[query_idx]]):
+        similarities = content_analyzer.similarity_row(rows[query_idx]) * 100
+        known = rows >= 0
+        content_scores[known] = similarities[rows[known]]
     
-    if words1 and words2:
-        intersection = len(words1 & words2)
-        union = len(words1 | words2)
-        path_score = (intersection / union) * 100 if union > 0 else 0
+    # 3. URL path similarity (Jaccard on meaningful path words)
+    path_bits = features['path_bits']
+    if features['path_words'][query_idx]:
+        path_intersection = np.bitwise_count(path_bits & path_bits[query_idx]).sum(axis=1)
+        path_union = np.bitwise_count(path_bits | path_bits[query_idx]).sum(axis=1)
+        path_scores = (path_intersection / path_union) * 100
     else:
-        path_score = 0
+        path_scores = np.zeros(n)
     
     # 4. Content depth alignment
-    wc1 = content1.get('word_count', 0)
-    wc2 = content2.get('word_count', 0)
+    word_counts = features['word_counts']
+    query_wc = word_counts[query_idx]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        depth_diff = np.abs(query_wc - word_counts) / np.maximum(query_wc, word_counts)
+    depth_scores = np.where((query_wc > 0) & (word_counts > 0), (1 - depth_diff) * 100, 50)
     
-    if wc1 > 0 and wc2 > 0:
-        depth_diff = abs(wc1 - wc2) / max(wc1, wc2)
-        depth_score = (1 - depth_diff) * 100
+    # 5. Temporal relevance
+    timestamps = features['timestamps']
+    dated = features['has_date'] & features['has_date'][query_idx]
+    if link_direction == 'inbound':
+        # Sources newer than the query (target) article are preferred
+        temporal_scores = np.where(dated, np.where(timestamps > timestamps[query_idx], 70, 30), 50)
     else:
-        depth_score = 50  # Neutral score if no data
-    
-    # 5. Temporal relevance (for inbound links, prefer linking from newer to older)
-    temporal_score = 50  # Default neutral
-    date1 = content1.get('publish_date')
-    date2 = content2.get('publish_date')
-    
-    if date1 and date2:
-        if link_direction == 'inbound':
-            # For inbound: source (url1) should be newer than target (url2)
-            if date1 > date2:
-                temporal_score = 70
-            else:
-                temporal_score = 30
-        else:  # outbound
-            # For outbound: prefer linking to established (older) content
-            if date2 < date1:
-                temporal_score = 70
-            else:
-                temporal_score = 50
+        # Targets older than the query (source) article are preferred
+        temporal_scores = np.where(dated, np.where(timestamps < timestamps[query_idx], 70, 50), 50)
     
     # 6. Silo diversity bonus
-    silo1 = content1.get('silo', 'root')
-    silo2 = content2.get('silo', 'root')
+    silo_ids = features['silo_ids']
+    diversity_scores = np.where(silo_ids != silo_ids[query_idx], 70, 30)
     
-    if silo1 != silo2:
-        diversity_score = 70  # Bonus for cross-silo linking
-    else:
-        diversity_score = 30  # Lower score for same-silo
-    
-    # Calculate weighted final score with direction-specific weights
-    if link_direction == 'outbound':
-        # For outbound: prioritize content relevance and established content
-        weights = {
-            'tag': 0.25,
-            'content': 0.35,
-            'path': 0.10,
-            'depth': 0.10,
-            'temporal': 0.10,
-            'diversity': 0.10
-        }
-    else:  # inbound
-        # For inbound: prioritize diverse sources and temporal relevance
-        weights = {
-            'tag': 0.20,
-            'content': 0.30,
-            'path': 0.10,
-            'depth': 0.10,
-            'temporal': 0.15,
-            'diversity': 0.15
-        }
-    
-    final_score = (
-        tag_score * weights['tag'] +
-        content_score * weights['content'] +
-        path_score * weights['path'] +
-        depth_score * weights['depth'] +
-        temporal_score * weights['temporal'] +
-        diversity_score * weights['diversity']
-    )
+    # Weighted combination of all factors as one (6 x N) matrix-vector product
+    factors = np.vstack([
+        tag_scores, content_scores, path_scores, depth_scores, temporal_scores, diversity_scores
+    ])
+    weights = RELEVANCE_WEIGHTS[link_direction]
+    final_scores = np.array([weights[name] for name in RELEVANCE_FACTORS]) @ factors
+    factors = np.round(factors, 2)
     
-    return {
-        'final_score': round(final_score, 2),
-        'tag_score': round(tag_score, 2),
-        'content_score': round(content_score, 2),
-        'path_score': round(path_score, 2),
-        'depth_score': round(depth_score, 2),
-        'temporal_score': round(temporal_score, 2),
-        'diversity_score': round(diversity_score, 2),
-        'common_tags': list(tags1 & tags2),
-        'silo1': silo1,
-        'silo2': silo2
-    }
+    relevance = {f'{name}_score': factors[i] for i, name in enumerate(RELEVANCE_FACTORS)}
+    relevance['final_score'] = np.round(final_scores, 2)
+    return relevance
 
 
-def extract_path(url: str) -> str:
-    """Extract path from URL without domain"""
-    parsed = urlparse(url)
-    return parsed.path.strip('/')
+def top_k_indices(scores: np.ndarray, candidates: np.ndarray, k: int) -> np.ndarray:
+    """
+    Indices of the k highest-scoring candidates, best first
+    
+    Uses an O(N) partition instead of a full sort. Ties are broken by
+    position, exactly like heapq.nlargest / a stable descending sort.
+    """
+    candidate_scores = scores[candidates]
+    if len(candidates) > k:
+        kth = np.partition(candidate_scores, len(candidates) - k)[len(candidates) - k]
+        above = candidates[candidate_scores > kth]
+        ties = candidates[candidate_scores == kth][:k - len(above)]
+        candidates = np.sort(np.concatenate([above, ties]))
+        candidate_scores = scores[candidates]
+    return candidates[np.argsort(-candidate_scores, kind='stable')]
 
 
 def apply_diversity_penalties(opportunities: List[Dict], max_per_silo: int = MAX_LINKS_PER_SILO) -> List[Dict]:
@@ -464,7 +1160,8 @@ def find_enhanced_outbound_opportunities(
     content_cache: Dict,
     content_analyzer: ContentAnalyzer,
     min_relevance: float,
-    max_results: int = 20
+    max_results: int = 20,
+    features: Optional[Dict] = None
 ) -> List[Dict]:
     """
     Find outbound linking opportunities with enhanced logic
@@ -476,48 +1173,47 @@ def find_enhanced_outbound_opportunities(
     - Apply diversity to avoid repetitive patterns
     """
     opportunities = []
+    if features is None:
+        features = precompute_features(new_url, all_urls, content_cache, content_analyzer)
+    urls = features['urls']
+    new_idx = urls.index(new_url)
+    new_tags = features['tag_sets'][new_idx]
+    relevance = calculate_enhanced_relevance_batch(new_idx, features, content_analyzer, 'outbound')
     
-    for target_url in all_urls:
-        if target_url == new_url:
-            continue
-        
-        relevance = calculate_enhanced_relevance(
-            new_url, target_url, content_cache, content_analyzer, 'outbound'
-        )
+    # Boost score for pillar content (high word count, many headings)
+    boosts = np.where(features['word_counts'] > 1500, 1.1, 1.0)  # 10% boost for long-form content
+    final_scores = relevance['final_score'] * boosts
+    
+    candidates = np.flatnonzero(
+        (relevance['final_score'] >= min_relevance) & (np.array(urls, dtype=object) != new_url)
+    )
+    
+    # Only the strongest candidates are materialized as result dicts
+    for idx in top_k_indices(final_scores, candidates, max_results * 2):
+        target_url = urls[idx]
+        target_content = content_cache.get(target_url, {})
         
-        if relevance['final_score'] >= min_relevance:
-            target_content = content_cache.get(target_url, {})
-            
-            # Boost score for pillar content (high word count, many headings)
-            if target_content.get('word_count', 0) > 1500:
-                relevance['final_score'] *= 1.1  # 10% boost for long-form content
-            
-            opportunities.append({
-                'url': target_url,
-                'title': target_content.get('title', ''),
-                'final_score': relevance['final_score'],
-                'tag_score': relevance['tag_score'],
-                'content_score': relevance['content_score'],
-                'path_score': relevance['path_score'],
-                'depth_score': relevance['depth_score'],
-                'temporal_score': relevance['temporal_score'],
-                'diversity_score': relevance['diversity_score'],
-                'common_tags': relevance['common_tags'],
-                'target_silo': relevance['silo2'],
-                'word_count': target_content.get('word_count', 0),
-                'publish_date': target_content.get('publish_date')
-            })
-    
-    # Sort by score
-    opportunities = sorted(opportunities, key=lambda x: x['final_score'], reverse=True)
+        opportunities.append({
+            'url': target_url,
+            'title': target_content.get('title', ''),
+            'final_score': float(final_scores[idx]),
+            'tag_score': float(relevance['tag_score'][idx]),
+            'content_score': float(relevance['content_score'][idx]),
+            'path_score': float(relevance['path_score'][idx]),
+            'depth_score': float(relevance['depth_score'][idx]),
+            'temporal_score': float(relevance['temporal_score'][idx]),
+            'diversity_score': float(relevance['diversity_score'][idx]),
+            'common_tags': list(new_tags & features['tag_sets'][idx]),
+            'target_silo': features['silos'][idx],
+            'word_count': target_content.get('word_count', 0),
+            'publish_date': target_content.get('publish_date')
+        })
     
     # Apply diversity penalties
-    opportunities = apply_diversity_penalties(opportunities[:max_results * 2])
-    
-    # Re-sort after penalties and return top results
-    opportunities = sorted(opportunities, key=lambda x: x['final_score'], reverse=True)
+    opportunities = apply_diversity_penalties(opportunities)
     
-    return opportunities[:max_results]
+    # Re-rank after penalties and return top results
+    return heapq.nlargest(max_results, opportunities, key=itemgetter('final_score'))
 
 
 def find_enhanced_inbound_opportunities(
@@ -526,7 +1222,8 @@ def find_enhanced_inbound_opportunities(
     content_cache: Dict,
     content_analyzer: ContentAnalyzer,
     min_relevance: float,
-    max_results: int = 20
+    max_results: int = 20,
+    features: Optional[Dict] = None
 ) -> List[Dict]:
     """
     Find inbound linking opportunities with differentiated logic
@@ -538,83 +1235,85 @@ def find_enhanced_inbound_opportunities(
     - Different scoring weights than outbound
     """
     opportunities = []
-    new_content = content_cache.get(new_url, {})
+    if features is None:
+        features = precompute_features(new_url, all_urls, content_cache, content_analyzer)
+    urls = features['urls']
+    new_idx = urls.index(new_url)
+    new_tags = features['tag_sets'][new_idx]
+    relevance = calculate_enhanced_relevance_batch(new_idx, features, content_analyzer, 'inbound')
     
-    for source_url in all_urls:
-        if source_url == new_url:
-            continue
-        
-        relevance = calculate_enhanced_relevance(
-            source_url, new_url, content_cache, content_analyzer, 'inbound'
-        )
+    # Boost score for content published after the new article (if dates available)
+    timestamps = features['timestamps']
+    newer = features['has_date'] & features['has_date'][new_idx] & (timestamps > timestamps[new_idx])
+    final_scores = relevance['final_score'] * np.where(newer, 1.15, 1.0)  # 15% boost for newer content
+    
+    candidates = np.flatnonzero(
+        (relevance['final_score'] >= min_relevance) & (np.array(urls, dtype=object) != new_url)
+    )
+    
+    # Only the strongest candidates are materialized as result dicts
+    for idx in top_k_indices(final_scores, candidates, max_results * 2):
+        source_url = urls[idx]
+        source_content = content_cache.get(source_url, {})
         
-        if relevance['final_score'] >= min_relevance:
-            source_content = content_cache.get(source_url, {})
-            
-            # Boost score for content published after the new article (if dates available)
-            if new_content.get('publish_date') and source_content.get('publish_date'):
-                if source_content['publish_date'] > new_content['publish_date']:
-                    relevance['final_score'] *= 1.15  # 15% boost for newer content
-            
-            opportunities.append({
-                'url': source_url,
-                'title': source_content.get('title', ''),
-                'final_score': relevance['final_score'],
-                'tag_score': relevance['tag_score'],
-                'content_score': relevance['content_score'],
-                'path_score': relevance['path_score'],
-                'depth_score': relevance['depth_score'],
-                'temporal_score': relevance['temporal_score'],
-                'diversity_score': relevance['diversity_score'],
-                'common_tags': relevance['common_tags'],
-                'source_silo': relevance['silo1'],
-                'word_count': source_content.get('word_count', 0),
-                'publish_date': source_content.get('publish_date')
-            })
-    
-    # Sort by score
-    opportunities = sorted(opportunities, key=lambda x: x['final_score'], reverse=True)
+        opportunities.append({
+            'url': source_url,
+            'title': source_content.get('title', ''),
+            'final_score': float(final_scores[idx]),
+            'tag_score': float(relevance['tag_score'][idx]),
+            'content_score': float(relevance['content_score'][idx]),
+            'path_score': float(relevance['path_score'][idx]),
+            'depth_score': float(relevance['depth_score'][idx]),
+            'temporal_score': float(relevance['temporal_score'][idx]),
+            'diversity_score': float(relevance['diversity_score'][idx]),
+            'common_tags': list(new_tags & features['tag_sets'][idx]),
+            'source_silo': features['silos'][idx],
+            'word_count': source_content.get('word_count', 0),
+            'publish_date': source_content.get('publish_date')
+        })
     
     # Apply stronger diversity for inbound to get links from various sources
-    opportunities = apply_diversity_penalties(opportunities[:max_results * 2], max_per_silo=1)
+    opportunities = apply_diversity_penalties(opportunities, max_per_silo=1)
     
     # Re-sort and return top results
-    opportunities = sorted(opportunities, key=lambda x: x['final_score'], reverse=True)
+    opportunities.sort(key=itemgetter('final_score'), reverse=True)
     
-    # Add variation: if multiple opportunities have very similar scores, shuffle slightly
+    # Add variation: shuffle opportunities that fall in the same 5-point score band
     if len(opportunities) > 5:
-        # Group by score ranges
-        score_groups = []
-        current_group = []
-        last_score = opportunities[0]['final_score']
-        
-        for opp in opportunities:
-            if abs(opp['final_score'] - last_score) < 5:  # Within 5% score range
-                current_group.append(opp)
-            else:
-                if current_group:
-                    score_groups.append(current_group)
-                current_group = [opp]
-                last_score = opp['final_score']
-        
-        if current_group:
-            score_groups.append(current_group)
-        
-        # Shuffle within groups for variety
-        import random
-        random.seed(hash(new_url))  # Consistent shuffle per URL
-        
-        shuffled_opportunities = []
+        rng = random.Random(hash(new_url))  # Consistent shuffle per URL
+        score_groups = [
+            list(group)
+            for _, group in groupby(opportunities, key=lambda x: int(x['final_score'] // 5))
+        ]
         for group in score_groups:
             if len(group) > 1:
-                random.shuffle(group)
-            shuffled_opportunities.extend(group)
-        
-        opportunities = shuffled_opportunities
+                rng.shuffle(group)
+        opportunities = [opp for group in score_groups for opp in group]
     
     return opportunities[:max_results]
 
 
+def build_opportunity_table(opportunities: List[Dict], silo_key: str) -> pd.DataFrame:
+    """
+    Display table for outbound (silo_key='target_silo') or inbound
+    (silo_key='source_silo') opportunities, formatted column-wise
+    """
+    df = pd.DataFrame.from_records(opportunities)
+    titles = df['title'].str.slice(0, 60) + np.where(df['title'].str.len() > 60, '...', '')
+    common_tags = df['common_tags'].str.slice(0, 3).str.join(', ')
+    
+    return pd.DataFrame({
+        'Title': titles,
+        'Silo': df[silo_key],
+        'Score': df['final_score'].map('{:.1f}%'.format),
+        'Content Match': df['content_score'].map('{:.1f}%'.format),
+        'Tags Match': df['tag_score'].map('{:.1f}%'.format),
+        'Words': df['word_count'].map('{:,}'.format).where(df['word_count'] != 0, '-'),
+        'Common Tags': common_tags.where(df['common_tags'].str.len() > 0, '-'),
+        'URL': df['url']
+    })
+
+
 # ============================================================================
 # SIDEBAR CONFIGURATION
 # ============================================================================
@@ -669,6 +1368,14 @@ fetch_timeout = st.sidebar.slider(
     help="Time to wait for each page to load"
 )
 
+fetch_workers = st.sidebar.slider(
+    "Concurrent Page Fetches",
+    min_value=1,
+    max_value=MAX_FETCH_WORKERS,
+    value=DEFAULT_FETCH_WORKERS,
+    help="Pages fetched in parallel; lower this if the site rate-limits requests"
+)
+
 enable_tfidf = st.sidebar.checkbox(
     "Enable TF-IDF Content Analysis",
     value=True,
@@ -738,13 +1445,11 @@ if st.sidebar.button("🔍 Analyze Internal Linking", type="primary", use_contai
             total_words = 0
             silos = set()
             
-            for idx, url in enumerate(all_urls):
-                status_text.text(f"Analyzing {idx + 1}/{len(all_urls)}: {url[:50]}...")
-                progress = (idx + 1) / len(all_urls)
-                progress_bar.progress(progress)
-                
-                # Fetch comprehensive content
-                content = fetch_page_content(url, timeout=fetch_timeout)
+            # Each widget update is a websocket round-trip, so refresh about 100 times per run
+            update_every = max(1, len(all_urls) // 100)
+            
+            pages = fetch_all_pages(all_urls, timeout=fetch_timeout, max_workers=fetch_workers)
+            for idx, (url, content) in enumerate(pages):
                 content_cache[url] = content
                 
                 # Update metrics
@@ -752,13 +1457,21 @@ if st.sidebar.button("🔍 Analyze Internal Linking", type="primary", use_contai
                 total_words += content.get('word_count', 0)
                 silos.add(content.get('silo', 'root'))
                 
+                if (idx + 1) % update_every and idx != len(all_urls) - 1:
+                    continue
+                
+                status_text.text(f"Analyzing {idx + 1}/{len(all_urls)}: {url[:50]}...")
+                progress = (idx + 1) / len(all_urls)
+                progress_bar.progress(progress)
+                
                 # Update live metrics
                 metrics['pages'].metric("Pages Analyzed", f"{idx + 1}/{len(all_urls)}")
                 metrics['tags'].metric("Unique Tags", len(total_tags))
                 metrics['words'].metric("Total Words", f"{total_words:,}")
                 metrics['silos'].metric("Silos Found", len(silos))
-                
-                time.sleep(0.1)  # Rate limiting
+            
+            # Pages complete out of order; keep the cache in sitemap order
+            content_cache = {url: content_cache[url] for url in all_urls}
             
             progress_bar.empty()
             status_text.empty()
@@ -768,30 +1481,28 @@ if st.sidebar.button("🔍 Analyze Internal Linking", type="primary", use_contai
             # Prepare TF-IDF analysis if enabled
             if enable_tfidf:
                 with st.spinner("🧮 Building semantic model..."):
-                    # Combine all text content for TF-IDF
-                    text_content = {}
-                    for url, content in content_cache.items():
-                        combined_text = ' '.join([
-                            content.get('title', ''),
-                            content.get('description', ''),
-                            ' '.join(content.get('headings', [])),
-                            content.get('body_text', '')
-                        ])
-                        text_content[url] = combined_text
-                    
-                    content_analyzer.fit_content(text_content)
+                    # Documents are generated on demand from the cache, one row per URL
+                    ordered_urls = list(content_cache)
+                    content_analyzer = build_analyzer(
+                        make_corpus_key(ordered_urls, content_cache), ordered_urls, content_cache
+                    )
                     st.success("✅ Semantic model ready!")
             
             # Find opportunities with enhanced algorithms
             with st.spinner("🔍 Finding linking opportunities with advanced algorithms..."):
+                # Per-URL features are derived once and shared by both directions
+                features = precompute_features(new_article_url, all_urls, content_cache, content_analyzer)
+                
                 outbound = find_enhanced_outbound_opportunities(
                     new_article_url, all_urls, content_cache, 
-                    content_analyzer, min_relevance_score, max_results
+                    content_analyzer, min_relevance_score, max_results,
+                    features=features
                 )
                 
                 inbound = find_enhanced_inbound_opportunities(
                     new_article_url, all_urls, content_cache,
-                    content_analyzer, min_relevance_score, max_results
+                    content_analyzer, min_relevance_score, max_results,
+                    features=features
                 )
             
             # Display enhanced metrics
@@ -842,16 +1553,7 @@ if st.sidebar.button("🔍 Analyze Internal Linking", type="primary", use_contai
             
             if outbound:
                 # Create enhanced dataframe
-                outbound_df = pd.DataFrame([{
-                    'Title': opp['title'][:60] + '...' if len(opp['title']) > 60 else opp['title'],
-                    'Silo': opp['target_silo'],
-                    'Score': f"{opp['final_score']:.1f}%",
-                    'Content Match': f"{opp['content_score']:.1f}%",
-                    'Tags Match': f"{opp['tag_score']:.1f}%",
-                    'Words': f"{opp['word_count']:,}" if opp['word_count'] else '-',
-                    'Common Tags': ', '.join(opp['common_tags'][:3]) if opp['common_tags'] else '-',
-                    'URL': opp['url']
-                } for opp in outbound])
+                outbound_df = build_opportunity_table(outbound, 'target_silo')
                 
                 st.dataframe(
                     outbound_df.drop('URL', axis=1),
@@ -907,16 +1609,7 @@ if st.sidebar.button("🔍 Analyze Internal Linking", type="primary", use_contai
             
             if inbound:
                 # Create enhanced dataframe
-                inbound_df = pd.DataFrame([{
-                    'Title': opp['title'][:60] + '...' if len(opp['title']) > 60 else opp['title'],
-                    'Silo': opp['source_silo'],
-                    'Score': f"{opp['final_score']:.1f}%",
-                    'Content Match': f"{opp['content_score']:.1f}%",
-                    'Tags Match': f"{opp['tag_score']:.1f}%",
-                    'Words': f"{opp['word_count']:,}" if opp['word_count'] else '-',
-                    'Common Tags': ', '.join(opp['common_tags'][:3]) if opp['common_tags'] else '-',
-                    'URL': opp['url']
-                } for opp in inbound])
+                inbound_df = build_opportunity_table(inbound, 'source_silo')
                 
                 st.dataframe(
                     inbound_df.drop('URL', axis=1),
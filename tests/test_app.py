@@ -0,0 +1,302 @@
+"""
+Tests for the pure helpers in app.py
+
+Importing app runs the Streamlit script in bare mode; the analysis itself
+only runs behind the sidebar button, so nothing is fetched at import time.
+"""
+
+import os
+import time
+from email.utils import format_datetime
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+import requests
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+import app
+
+
+DOCS = [
+    "python seo guide for ghost blogs",
+    "python data science tutorial",
+    "ghost blog seo tips and internal links",
+    "marketing tips for content writers",
+    "python seo guide for ghost blogs",
+    "internal links and seo content",
+]
+URLS = [f"https://example.com/post-{i}/" for i in range(len(DOCS))]
+
+
+def make_response(retry_after=None) -> requests.Response:
+    """A 429 response, optionally carrying a Retry-After header"""
+    response = requests.Response()
+    response.status_code = 429
+    if retry_after is not None:
+        response.headers['Retry-After'] = retry_after
+    return response
+
+
+@pytest.fixture
+def tfidf_cache_dir(tmp_path, monkeypatch):
+    """Persist TF-IDF fits to a per-test directory"""
+    monkeypatch.setattr(app, 'TFIDF_CACHE_DIR', str(tmp_path))
+    return tmp_path
+
+
+# ----------------------------------------------------------------------------
+# Retry-After / rate limiting
+# ----------------------------------------------------------------------------
+
+def test_retry_after_seconds_parses_delta_seconds():
+    """Retry-After given in seconds, never negative"""
+    assert app._retry_after_seconds(make_response('5')) == 5.0
+    assert app._retry_after_seconds(make_response('-3')) == 0.0
+
+
+def test_retry_after_seconds_parses_http_date():
+    """Retry-After given as an HTTP date"""
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    seconds = app._retry_after_seconds(make_response(format_datetime(retry_at, usegmt=True)))
+    assert 25 <= seconds <= 30
+
+
+def test_retry_after_seconds_ignores_missing_or_invalid_header():
+    """No usable Retry-After yields None"""
+    assert app._retry_after_seconds(make_response()) is None
+    assert app._retry_after_seconds(make_response('soon')) is None
+
+
+def test_rate_limiter_backs_off_and_recovers():
+    """Each 429/503 doubles the interval; each success halves it"""
+    limiter = app.HostRateLimiter()
+    limiter.succeeded('example.com')
+    assert 'example.com' not in limiter.interval
+    
+    limiter.throttled('example.com')
+    assert limiter.interval['example.com'] == app.MIN_BACKOFF
+    limiter.throttled('example.com')
+    assert limiter.interval['example.com'] == app.MIN_BACKOFF * 2
+    
+    limiter.succeeded('example.com')
+    assert limiter.interval['example.com'] == app.MIN_BACKOFF
+    limiter.succeeded('example.com')
+    assert 'example.com' not in limiter.interval
+
+
+def test_rate_limiter_honors_retry_after_up_to_max_backoff():
+    """Retry-After sets the interval, capped at MAX_BACKOFF"""
+    limiter = app.HostRateLimiter()
+    limiter.throttled('a.example', retry_after=7.0)
+    limiter.throttled('b.example', retry_after=3600.0)
+    assert limiter.interval['a.example'] == 7.0
+    assert limiter.interval['b.example'] == app.MAX_BACKOFF
+
+
+def test_rate_limiter_wait_spaces_requests_per_host(monkeypatch):
+    """Only the throttled host waits"""
+    slept = []
+    monkeypatch.setattr(app.time, 'sleep', slept.append)
+    limiter = app.HostRateLimiter()
+    
+    limiter.wait('example.com')
+    assert slept == []  # Unthrottled hosts never wait
+    
+    limiter.throttled('example.com', retry_after=2.0)
+    limiter.wait('example.com')
+    limiter.wait('other.example')
+    assert len(slept) == 1 and 0 < slept[0] <= 2.0
+    assert limiter.next_allowed['example.com'] > time.monotonic() + 2.0
+
+
+# ----------------------------------------------------------------------------
+# Scoring helpers
+# ----------------------------------------------------------------------------
+
+def test_top_k_indices_matches_stable_descending_sort():
+    """Partition-based top-k equals a stable descending sort"""
+    rng = np.random.default_rng(0)
+    scores = rng.integers(0, 5, size=200).astype(float)
+    candidates = np.flatnonzero(rng.random(200) > 0.3)
+    for k in (1, 5, 20, len(candidates), len(candidates) + 10):
+        expected = sorted(candidates, key=lambda i: -scores[i])[:k]
+        assert list(app.top_k_indices(scores, candidates, k)) == expected
+
+
+def test_build_bitsets_popcounts_match_set_operations():
+    """Popcounts of the bit rows equal set intersection / union sizes"""
+    item_sets = [
+        frozenset({'python', 'seo'}),
+        frozenset(),
+        frozenset({'seo', 'ghost', 'links'}),
+        frozenset(f"word{i}" for i in range(70)),  # Spills into a second uint64
+    ]
+    bits = app.build_bitsets(item_sets)
+    assert bits.dtype == np.uint64 and bits.shape == (4, 2)
+    for i, a in enumerate(item_sets):
+        for j, b in enumerate(item_sets):
+            assert np.bitwise_count(bits[i] & bits[j]).sum() == len(a & b)
+            assert np.bitwise_count(bits[i] | bits[j]).sum() == len(a | b)
+
+
+def test_build_bitsets_without_items():
+    """Empty sets still produce one zero word per row"""
+    bits = app.build_bitsets([frozenset(), frozenset()])
+    assert bits.shape == (2, 1) and not bits.any()
+
+
+# ----------------------------------------------------------------------------
+# Sitemaps
+# ----------------------------------------------------------------------------
+
+def fake_sitemaps(monkeypatch, sitemaps):
+    """Serve `sitemaps` ({url: (is_index, locs)}) in place of HTTP; other URLs fail"""
+    fetched = []
+    
+    def fetch(session, sitemap_url):
+        fetched.append(sitemap_url)
+        if sitemap_url not in sitemaps:
+            raise requests.HTTPError(f"404 for {sitemap_url}")
+        return sitemaps[sitemap_url]
+    
+    monkeypatch.setattr(app, '_fetch_child_sitemap', fetch)
+    return fetched
+
+
+def test_expand_sitemap_index_stops_at_max_depth(monkeypatch):
+    """Nested indexes are followed for MAX_SITEMAP_DEPTH levels only"""
+    depth = app.MAX_SITEMAP_DEPTH + 2
+    sitemaps = {
+        f"index-{level}.xml": (True, [f"index-{level + 1}.xml", f"pages-{level}.xml"])
+        for level in range(depth)
+    }
+    sitemaps.update({f"pages-{level}.xml": (False, [f"page-{level}"]) for level in range(depth)})
+    fetched = fake_sitemaps(monkeypatch, sitemaps)
+    
+    urls = app.expand_sitemap_index(['index-0.xml'])
+    
+    # Level n of the walk fetches index-n and pages-(n-1)
+    assert sorted(urls) == [f"page-{level}" for level in range(app.MAX_SITEMAP_DEPTH - 1)]
+    assert f"index-{app.MAX_SITEMAP_DEPTH}.xml" not in fetched
+
+
+def test_expand_sitemap_index_visits_each_sitemap_once(monkeypatch):
+    """Sitemaps listed twice (or by themselves) are fetched once"""
+    fetched = fake_sitemaps(monkeypatch, {
+        'posts.xml': (False, ['post-1', 'post-2']),
+        'nested.xml': (True, ['posts.xml', 'nested.xml']),
+    })
+    assert sorted(app.expand_sitemap_index(['posts.xml', 'nested.xml'])) == ['post-1', 'post-2']
+    assert sorted(fetched) == ['nested.xml', 'posts.xml']
+
+
+def test_expand_sitemap_index_reports_failed_children(monkeypatch):
+    """A failed child sitemap raises with the URLs that did load"""
+    fake_sitemaps(monkeypatch, {'pages.xml': (False, ['about', 'contact'])})
+    with pytest.raises(app.PartialSitemapError) as excinfo:
+        app.expand_sitemap_index(['pages.xml', 'posts.xml'])
+    assert excinfo.value.failed == ['posts.xml']
+    assert excinfo.value.urls == ['about', 'contact']
+
+
+# ----------------------------------------------------------------------------
+# TF-IDF fitting and its on-disk cache
+# ----------------------------------------------------------------------------
+
+def fit(docs=DOCS, urls=URLS) -> app.ContentAnalyzer:
+    """ContentAnalyzer fitted on `docs`, one per URL"""
+    content_analyzer = app.ContentAnalyzer()
+    content_analyzer.fit_documents(urls, lambda: iter(docs))
+    return content_analyzer
+
+
+def test_fit_documents_matches_plain_tfidf_fit(tfidf_cache_dir):
+    """Deduplicated fit gives every URL its row from a plain fit"""
+    content_analyzer = fit()
+    expected = TfidfVectorizer(**app.TFIDF_PARAMS).fit_transform(DOCS).toarray()
+    rows = [content_analyzer.url_to_idx[url] for url in URLS]
+    
+    # The duplicated document shares one row, with the weights of the full fit
+    assert content_analyzer.tfidf_matrix.shape[0] == len(set(DOCS))
+    np.testing.assert_allclose(content_analyzer.tfidf_matrix[rows].toarray(), expected, rtol=1e-6)
+    assert content_analyzer.has_content.all()
+
+
+def test_score_against_scores_every_url(tfidf_cache_dir):
+    """score_against() returns one cosine similarity per fitted URL"""
+    content_analyzer = fit()
+    scores = content_analyzer.score_against(URLS[0])
+    
+    assert scores.shape == (len(URLS),)
+    assert scores[0] == pytest.approx(1.0)
+    assert scores[4] == pytest.approx(1.0)  # Same document as URLS[0]
+    assert scores[3] == pytest.approx(0.0)  # No shared terms
+    assert 0 < scores[2] < 1
+    assert not content_analyzer.score_against('https://example.com/unknown/').any()
+
+
+def test_fit_documents_reuses_persisted_fit(tfidf_cache_dir, monkeypatch):
+    """A second fit of the same corpus loads from disk"""
+    first = fit()
+    assert len(list(tfidf_cache_dir.glob('tfidf_*.joblib'))) == 1
+    
+    def refit(*args, **kwargs):
+        raise AssertionError("persisted fit was not reused")
+    
+    monkeypatch.setattr(app.TfidfVectorizer, 'fit', refit)
+    monkeypatch.setattr(app.TfidfVectorizer, 'fit_transform', refit)
+    second = fit()
+    np.testing.assert_array_equal(first.tfidf_matrix.toarray(), second.tfidf_matrix.toarray())
+
+
+def test_evict_tfidf_cache_keeps_most_recently_used(tfidf_cache_dir):
+    """Eviction keeps the newest fits and ignores other files"""
+    now = time.time()
+    for age in range(5):
+        path = tfidf_cache_dir / f"tfidf_{age}.joblib"
+        path.write_bytes(b'')
+        os.utime(path, (now - age * 60, now - age * 60))
+    (tfidf_cache_dir / 'unrelated.txt').write_bytes(b'')
+    
+    app.evict_tfidf_cache(max_files=2)
+    
+    assert sorted(os.listdir(tfidf_cache_dir)) == ['tfidf_0.joblib', 'tfidf_1.joblib', 'unrelated.txt']
+
+
+def test_evict_tfidf_cache_without_cache_dir(tmp_path, monkeypatch):
+    """A missing cache directory is not an error"""
+    monkeypatch.setattr(app, 'TFIDF_CACHE_DIR', str(tmp_path / 'missing'))
+    app.evict_tfidf_cache(max_files=0)
+
+
+class FailingGpuTfidfVectorizer:
+    """Stands in for cuML on a machine whose CUDA driver cannot be used"""
+    
+    def __init__(self, **params):
+        raise RuntimeError("CUDA driver version is insufficient for CUDA runtime version")
+
+
+def test_gpu_failure_falls_back_to_cpu_fit(tfidf_cache_dir, monkeypatch):
+    """A cuML/CUDA error refits on the CPU instead of dropping content similarity"""
+    expected = fit().tfidf_matrix.toarray()
+    for path in tfidf_cache_dir.iterdir():
+        path.unlink()
+    
+    monkeypatch.setattr(app, 'GpuTfidfVectorizer', FailingGpuTfidfVectorizer)
+    monkeypatch.setattr(app, 'GPU_TFIDF_MIN_DOCS', 1)
+    content_analyzer = fit()
+    
+    np.testing.assert_array_equal(content_analyzer.tfidf_matrix.toarray(), expected)
+    assert isinstance(content_analyzer.vectorizer, TfidfVectorizer)
+    # Persisted under the sklearn key, so a CPU-only process reuses it
+    assert content_analyzer._cache_path(iter(DOCS), 'sklearn') in {
+        str(path) for path in tfidf_cache_dir.glob('tfidf_*.joblib')
+    }
+
+
+def test_fit_documents_without_content(tfidf_cache_dir):
+    """An empty corpus leaves no matrix and no content rows"""
+    content_analyzer = fit(docs=['', '', ''], urls=URLS[:3])
+    assert content_analyzer.tfidf_matrix is None
+    assert not content_analyzer.has_content.any()